@@ -3,22 +3,15 @@
 import os
 import sys
 
-sys.path.insert(0, "/home/bk/source/vpype-vfab")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Set environment variables
 os.environ["DISPLAY"] = ""
 os.environ["QT_QPA_PLATFORM"] = "offscreen"
 
-import importlib.util
 from unittest.mock import MagicMock, patch
 
-# Import monitor module directly
-spec = importlib.util.spec_from_file_location(
-    "monitor", "/home/bk/source/vpype-vfab/vpype_plotty/monitor.py"
-)
-monitor = importlib.util.module_from_spec(spec)
-sys.modules["monitor"] = monitor
-spec.loader.exec_module(monitor)
+from vpype_vfab import monitor
 
 # Test what actually gets called
 mock_integration = MagicMock()
@@ -1,99 +1,189 @@
 """Batch processing example."""
 
+import argparse
+import asyncio
+import json
+import os
 import subprocess
-import time
 
-
-def generate_and_queue_sketches(seeds, base_name):
+# States a job never leaves once reached
+TERMINAL_STATES = {"COMPLETED", "FAILED", "CANCELLED"}
+
+# Upper bound on vpype processes queuing jobs at once
+MAX_CONCURRENT_JOBS = 8
+
+# Poll interval bounds for monitor_jobs, in seconds
+MIN_POLL_INTERVAL = 1.0
+MAX_POLL_INTERVAL = 30.0
+
+
+def _available_cpus():
+    """Return the number of CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _is_terminal(status):
+    """Return True if a status line reports a terminal job state."""
+    return any(state in status for state in TERMINAL_STATES)
+
+
+async def _queue_sketch(seed, base_name, limit):
+    """Generate a single sketch and queue it."""
+    async with limit:
+        proc = await asyncio.create_subprocess_exec(
+            "vpype",
+            "rand",
+            "--seed",
+            str(seed),
+            "linemerge",
+            "linesimplify",
+            "reloop",
+            "linesort",
+            "vfab-add",
+            "--name",
+            f"{base_name}_{seed}",
+            "--preset",
+            "fast",
+            "--queue",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, err = await proc.communicate()
+    return seed, proc.returncode, err.decode().strip()
+
+
+async def generate_and_queue_sketches(seeds, base_name):
     """Generate multiple sketches and queue them all."""
-    job_ids = []
-
-    for seed in seeds:
-        print(f"Processing seed {seed}...")
+    job_ids = set()
 
-        # Generate sketch using vpype
-        cmd = f"vpype rand --seed {seed} linemerge linesimplify reloop linesort"
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+    # Bound concurrency to the CPUs we may use and avoid overwhelming the database
+    limit = asyncio.Semaphore(min(MAX_CONCURRENT_JOBS, _available_cpus()))
 
-        if result.returncode != 0:
-            print(f"✗ Failed to generate sketch for seed {seed}: {result.stderr}")
-            continue
+    print(f"Processing seeds {', '.join(str(seed) for seed in seeds)}...")
+    results = await asyncio.gather(
+        *(_queue_sketch(seed, base_name, limit) for seed in seeds)
+    )
 
-        # Add to vfab
-        cmd = f'vpype rand --seed {seed} linemerge linesimplify reloop linesort vfab-add --name "{base_name}_{seed}" --preset fast --queue'
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-
-        if result.returncode == 0:
+    for seed, returncode, stderr in results:
+        if returncode == 0:
             print(f"✓ Queued job for seed {seed}")
-            job_ids.append(f"{base_name}_{seed}")
+            job_ids.add(f"{base_name}_{seed}")
         else:
-            print(f"✗ Failed to queue seed {seed}: {result.stderr}")
-
-        # Small delay to avoid overwhelming the system
-        time.sleep(0.1)
+            print(f"✗ Failed to queue seed {seed}: {stderr}")
 
     return job_ids
 
 
-def monitor_jobs(job_ids):
+async def _job_states():
+    """Fetch the state of every job with a single vfab-list call."""
+    proc = await asyncio.create_subprocess_exec(
+        "vpype",
+        "vfab-list",
+        "--format",
+        "json",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    out, _ = await proc.communicate()
+    if proc.returncode != 0:
+        return None
+
+    try:
+        jobs = json.loads(out)
+    except ValueError:  # "No jobs found."
+        jobs = []
+
+    return {job["name"]: job["state"] for job in jobs}
+
+
+async def monitor_jobs(job_ids):
     """Monitor job status."""
     print(f"\nMonitoring {len(job_ids)} jobs...")
 
+    interval = MIN_POLL_INTERVAL
     while job_ids:
         completed_jobs = []
 
-        for job_id in job_ids:
-            # Check job status
-            cmd = f"vpype plotty-status --name {job_id} --format simple"
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-
-            if result.returncode == 0:
-                status = result.stdout.strip()
-                print(f"  {job_id}: {status}")
+        # Check all job statuses in one pass
+        states = await _job_states()
 
-                if "COMPLETED" in status:
-                    completed_jobs.append(job_id)
-            else:
+        for job_id in sorted(job_ids):
+            if states is None or job_id not in states:
                 print(f"  {job_id}: Status check failed")
+                continue
+
+            status = states[job_id]
+            print(f"  {job_id}: {status}")
+
+            if _is_terminal(status):
+                completed_jobs.append(job_id)
 
         # Remove completed jobs
-        for job_id in completed_jobs:
-            job_ids.remove(job_id)
+        job_ids -= set(completed_jobs)
+
+        # Back off while nothing changes, poll quickly again after a transition
+        if completed_jobs:
+            interval = MIN_POLL_INTERVAL
+        else:
+            interval = min(interval * 1.5, MAX_POLL_INTERVAL)
 
         if job_ids:
             print(f"Waiting for {len(job_ids)} jobs...")
-            time.sleep(5)
+            await asyncio.sleep(interval)
 
 
 def main():
     """Main batch processing workflow."""
+    parser = argparse.ArgumentParser(
+        description="Generate random sketches and queue them in vfab"
+    )
+    parser.add_argument(
+        "--name",
+        default="batch_sketch",
+        help="Base name for generated jobs (default: batch_sketch)",
+    )
+    parser.add_argument(
+        "--seeds",
+        type=int,
+        default=5,
+        help="Number of sketches to generate (default: 5)",
+    )
+    parser.add_argument(
+        "--monitor",
+        action="store_true",
+        help="Monitor queued jobs until they complete",
+    )
+
+    args = parser.parse_args()
+
     print("=== vpype-vfab Batch Processing Example ===\n")
 
     # Configuration
-    base_name = "batch_sketch"
-    seed_count = 5
+    base_name = args.name
+    seed_count = args.seeds
 
     print(f"Generating {seed_count} sketches with base name '{base_name}'...")
 
     # Generate and queue sketches
-    job_ids = generate_and_queue_sketches(range(seed_count), base_name)
+    job_ids = asyncio.run(generate_and_queue_sketches(range(seed_count), base_name))
 
     if not job_ids:
         print("No jobs were successfully queued.")
         return
 
     print(f"\nSuccessfully queued {len(job_ids)} jobs:")
-    for job_id in job_ids:
+    for job_id in sorted(job_ids):
         print(f"  - {job_id}")
 
     # Show current queue status
     print("\nCurrent queue status:")
-    cmd = "vpype vfab-list --state QUEUED --format table"
-    subprocess.run(cmd, shell=True)
+    subprocess.run(["vpype", "vfab-list", "--state", "QUEUED", "--format", "table"])
 
     # Monitor jobs (optional)
-    if input("\nMonitor job completion? (y/n): ").lower() == "y":
-        monitor_jobs(job_ids)
+    if args.monitor:
+        asyncio.run(monitor_jobs(job_ids))
 
     print("\nBatch processing complete!")
 
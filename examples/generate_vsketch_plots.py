@@ -11,18 +11,20 @@ for QuickDraw plots (e.g., cat, dog, house, tree, etc.).
 """
 
 import argparse
+import functools
+import importlib
+import os
+import shlex
+import shutil
 import sys
 import time
 from pathlib import Path
 import subprocess
 
-# Add vsketch examples to path
+# Add vsketch to path
 vsketch_path = Path(__file__).parent.parent / "sandbox" / "vsketch"
 if vsketch_path.exists():
     sys.path.insert(0, str(vsketch_path))
-    sys.path.insert(0, str(vsketch_path / "examples" / "quick_draw"))
-    sys.path.insert(0, str(vsketch_path / "examples" / "schotter"))
-    sys.path.insert(0, str(vsketch_path / "examples" / "random_flower"))
 
 try:
     import vsketch
@@ -30,23 +32,44 @@ except ImportError:
     print("❌ vsketch not found. Please install it with: pip install vsketch")
     sys.exit(1)
 
-try:
-    from sketch_quick_draw import QuickDrawSketch
-except ImportError:
-    print("⚠️  QuickDraw sketch not found, will skip it")
-    QuickDrawSketch = None
+# Plot type -> (display name, example directory, module name, sketch class name)
+SKETCHES = {
+    "quickdraw": ("QuickDraw", "quick_draw", "sketch_quick_draw", "QuickDrawSketch"),
+    "schotter": ("Schotter", "schotter", "sketch_schotter", "SchotterSketch"),
+    "randomflower": (
+        "RandomFlower",
+        "random_flower",
+        "sketch_random_flower",
+        "RandomFlowerSketch",
+    ),
+}
 
-try:
-    from sketch_schotter import SchotterSketch
-except ImportError:
-    print("⚠️  Schotter sketch not found, will skip it")
-    SchotterSketch = None
+# Standard vpype optimization pipeline applied before adding to vfab
+OPTIMIZE_PIPELINE = "linemerge linesimplify reloop linesort"
 
-try:
-    from sketch_random_flower import RandomFlowerSketch
-except ImportError:
-    print("⚠️  RandomFlower sketch not found, will skip it")
-    RandomFlowerSketch = None
+# Records the vpype executable mtime once the vfab plugin has been detected
+PLUGIN_CHECK_CACHE = Path.home() / ".cache" / "vpype-vfab" / "plugin_ok"
+
+
+@functools.cache
+def load_sketch(plot_type: str):
+    """Import the sketch class for a plot type on first use.
+
+    Returns None if the sketch example is not available.
+    """
+    display_name, example_dir, module_name, class_name = SKETCHES[plot_type]
+
+    example_path = vsketch_path / "examples" / example_dir
+    if example_path.exists() and str(example_path) not in sys.path:
+        sys.path.insert(0, str(example_path))
+
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError:
+        print(f"⚠️  {display_name} sketch not found, will skip it")
+        return None
+
+    return getattr(module, class_name)
 
 
 def setup_workspace(workspace_path: str) -> str:
@@ -73,36 +96,32 @@ def finalize_with_vfab(
     workspace: str,
     preset: str,
     queue: bool,
-    save_svg: bool = True,
+    save_svg: bool = False,
     output_dir: Path | None = None,
     verbose: bool = False,
 ) -> None:
     """Apply vpype optimization and add to vfab."""
-    # Standard vpype optimization
-    vpype_cmd = "linemerge linesimplify reloop linesort"
-    if verbose:
-        print(f"🔧 Executing vpype command: {vpype_cmd}")
-    vsk.vpype(vpype_cmd)
-
-    # Save SVG if requested
-    if save_svg and output_dir:
-        svg_path = output_dir / f"{job_name}.svg"
-        vsk.save(str(svg_path))
-        print(f"💾 Saved SVG: {svg_path}")
-
     # Build vfab-add command
-    cmd = f"vfab-add --name {job_name} --preset {preset}"
+    parts = ["vfab-add", "--name", job_name, "--preset", preset]
     if workspace:
-        cmd += f" --workspace {workspace}"
+        parts += ["--workspace", workspace]
     if queue:
-        cmd += " --queue"
+        parts.append("--queue")
+    cmd = shlex.join(parts)
 
-    # Add to vfab
+    # Optimize and add to vfab in a single vpype pipeline
     if verbose:
+        print(f"🔧 Executing vpype command: {OPTIMIZE_PIPELINE}")
         print(f"🔧 Executing vfab command: {cmd}")
-    vsk.vpype(cmd)
+    vsk.vpype(f"{OPTIMIZE_PIPELINE} {cmd}")
     print(f"✅ Added to vfab: {job_name} (preset: {preset}, queued: {queue})")
 
+    # Save the optimized SVG if requested
+    if save_svg and output_dir:
+        svg_path = output_dir / f"{job_name}.svg"
+        vsk.save(str(svg_path))
+        print(f"💾 Saved SVG: {svg_path}")
+
 
 def generate_quickdraw_plot(
     category: str,
@@ -110,11 +129,13 @@ def generate_quickdraw_plot(
     workspace: str,
     preset: str,
     queue: bool,
-    output_dir: Path,
+    output_dir: Path | None,
     page_size: str = "a4",
     verbose: bool = False,
+    save_svg: bool = False,
 ) -> bool:
     """Generate QuickDraw plot."""
+    QuickDrawSketch = load_sketch("quickdraw")
     if QuickDrawSketch is None:
         print("❌ QuickDraw sketch not available")
         return False
@@ -140,7 +161,7 @@ def generate_quickdraw_plot(
 
         # Finalize and add to vfab
         finalize_with_vfab(
-            vsk, job_name, workspace, preset, queue, True, output_dir, verbose
+            vsk, job_name, workspace, preset, queue, save_svg, output_dir, verbose
         )
 
         return True
@@ -156,11 +177,13 @@ def generate_schotter_plot(
     workspace: str,
     preset: str,
     queue: bool,
-    output_dir: Path,
+    output_dir: Path | None,
     page_size: str = "a4",
     verbose: bool = False,
+    save_svg: bool = False,
 ) -> bool:
     """Generate Schotter plot."""
+    SchotterSketch = load_sketch("schotter")
     if SchotterSketch is None:
         print("❌ Schotter sketch not available")
         return False
@@ -183,7 +206,7 @@ def generate_schotter_plot(
 
         # Finalize and add to vfab
         finalize_with_vfab(
-            vsk, job_name, workspace, preset, queue, True, output_dir, verbose
+            vsk, job_name, workspace, preset, queue, save_svg, output_dir, verbose
         )
 
         return True
@@ -198,11 +221,13 @@ def generate_randomflower_plot(
     workspace: str,
     preset: str,
     queue: bool,
-    output_dir: Path,
+    output_dir: Path | None,
     page_size: str = "a4",
     verbose: bool = False,
+    save_svg: bool = False,
 ) -> bool:
     """Generate RandomFlower plot."""
+    RandomFlowerSketch = load_sketch("randomflower")
     if RandomFlowerSketch is None:
         print("❌ RandomFlower sketch not available")
         return False
@@ -225,7 +250,7 @@ def generate_randomflower_plot(
 
         # Finalize and add to vfab
         finalize_with_vfab(
-            vsk, job_name, workspace, preset, queue, True, output_dir, verbose
+            vsk, job_name, workspace, preset, queue, save_svg, output_dir, verbose
         )
 
         return True
@@ -237,18 +262,43 @@ def generate_randomflower_plot(
 
 def check_vpype_vfab():
     """Check if vpype-vfab is available."""
+    vpype_bin = shutil.which("vpype")
+    if vpype_bin is None:
+        print("❌ vpype not found. Please install it with: pip install vpype")
+        return False
+
+    # Skip the (slow) vpype startup if this vpype install was already checked
+    vpype_mtime = str(int(os.path.getmtime(vpype_bin)))
     try:
-        result = subprocess.run(["vpype", "--help"], capture_output=True, text=True)
-        if "vfab" in result.stdout:
+        if PLUGIN_CHECK_CACHE.read_text() == vpype_mtime:
             return True
-        else:
-            print("❌ vpype-vfab plugin not found in vpype")
-            print("Install with: pipx inject vpype vpype-vfab")
-            return False
+    except OSError:
+        pass
+
+    try:
+        result = subprocess.run(
+            [vpype_bin, "--help"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
     except FileNotFoundError:
         print("❌ vpype not found. Please install it with: pip install vpype")
         return False
 
+    if "vfab" not in result.stdout:
+        print("❌ vpype-vfab plugin not found in vpype")
+        print("Install with: pipx inject vpype vpype-vfab")
+        return False
+
+    try:
+        PLUGIN_CHECK_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        PLUGIN_CHECK_CACHE.write_text(vpype_mtime)
+    except OSError:
+        pass  # Caching is best effort
+
+    return True
+
 
 def show_job_status(workspace: str):
     """Show current vfab job status."""
@@ -258,7 +308,9 @@ def show_job_status(workspace: str):
         if workspace:
             cmd.extend(["--workspace", workspace])
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = subprocess.run(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
         if result.returncode == 0:
             print(result.stdout)
         else:
@@ -267,42 +319,52 @@ def show_job_status(workspace: str):
         print(f"Error checking job status: {e}")
 
 
+def _quickdraw_config(i: int, categories: list, fuzziness_values: list) -> dict:
+    """Build the configuration for the i-th plot when it is a QuickDraw plot."""
+    category = categories[i % len(categories)] if categories else "cat"
+    return {
+        "type": "quickdraw",
+        "params": category,
+        "name": f"quickdraw_{category}_{i + 1}",
+    }
+
+
+def _schotter_config(i: int, categories: list, fuzziness_values: list) -> dict:
+    """Build the configuration for the i-th plot when it is a Schotter plot."""
+    fuzziness = fuzziness_values[i % len(fuzziness_values)] if fuzziness_values else 0.8
+    return {
+        "type": "schotter",
+        "params": fuzziness,
+        "name": f"schotter_{fuzziness}_{i + 1}",
+    }
+
+
+def _randomflower_config(i: int, categories: list, fuzziness_values: list) -> dict:
+    """Build the configuration for the i-th plot when it is a RandomFlower plot."""
+    return {
+        "type": "randomflower",
+        "params": None,
+        "name": f"randomflower_a4_{i + 1}",
+    }
+
+
+# Plot types in generation order, each with its configuration builder
+PLOT_CONFIG_BUILDERS = {
+    "quickdraw": _quickdraw_config,
+    "schotter": _schotter_config,
+    "randomflower": _randomflower_config,
+}
+
+
 def generate_plot_configs(
     num_plots: int, categories: list, fuzziness_values: list, page_size: str
 ) -> list:
     """Generate plot configurations based on number of plots requested."""
-    configs = []
-    plot_types = ["quickdraw", "schotter", "randomflower"]
-
-    for i in range(num_plots):
-        plot_type = plot_types[i % len(plot_types)]
-
-        if plot_type == "quickdraw":
-            category = categories[i % len(categories)] if categories else "cat"
-            config = {
-                "type": "quickdraw",
-                "params": category,
-                "name": f"quickdraw_{category}_{i + 1}",
-            }
-        elif plot_type == "schotter":
-            fuzziness = (
-                fuzziness_values[i % len(fuzziness_values)] if fuzziness_values else 0.8
-            )
-            config = {
-                "type": "schotter",
-                "params": fuzziness,
-                "name": f"schotter_{fuzziness}_{i + 1}",
-            }
-        else:  # randomflower
-            config = {
-                "type": "randomflower",
-                "params": None,
-                "name": f"randomflower_a4_{i + 1}",
-            }
-
-        configs.append(config)
-
-    return configs
+    builders = list(PLOT_CONFIG_BUILDERS.values())
+    return [
+        builders[i % len(builders)](i, categories, fuzziness_values)
+        for i in range(num_plots)
+    ]
 
 
 def main():
@@ -350,6 +412,11 @@ def main():
         default="a4",
         help="Page size for plots (default: a4, e.g., a3, a4, a5, letter, legal)",
     )
+    parser.add_argument(
+        "--save-svg",
+        action="store_true",
+        help="Save an SVG copy of each plot to the output directory",
+    )
     parser.add_argument(
         "--output-dir",
         "-O",
@@ -388,14 +455,20 @@ def main():
     # Setup workspace and output directory
     workspace = setup_workspace(args.workspace)
 
+    # SVG copies are only written on request (an explicit --output-dir implies it)
+    save_svg = args.save_svg or args.output_dir is not None
+
     # Set default output directory with timestamp if not provided
-    if args.output_dir is None:
-        output_dir = create_output_dir(f"/tmp/vsketch_plots_{int(time.time())}")
-    else:
-        output_dir = create_output_dir(args.output_dir)
+    output_dir = None
+    if save_svg:
+        if args.output_dir is None:
+            output_dir = create_output_dir(f"/tmp/vsketch_plots_{int(time.time())}")
+        else:
+            output_dir = create_output_dir(args.output_dir)
 
     print(f"📁 Workspace: {workspace}")
-    print(f"📁 Output directory: {output_dir}")
+    if output_dir:
+        print(f"📁 Output directory: {output_dir}")
     print(f"⚙️  Preset: {args.preset}")
     print(f"📋 Auto-queue: {queue}")
     print(f"📊 Number of plots: {args.num_plots}")
@@ -422,6 +495,7 @@ def main():
                 output_dir,
                 args.page_size,
                 args.verbose,
+                save_svg,
             )
         elif config["type"] == "schotter":
             success = generate_schotter_plot(
@@ -433,6 +507,7 @@ def main():
                 output_dir,
                 args.page_size,
                 args.verbose,
+                save_svg,
             )
         elif config["type"] == "randomflower":
             success = generate_randomflower_plot(
@@ -443,6 +518,7 @@ def main():
                 output_dir,
                 args.page_size,
                 args.verbose,
+                save_svg,
             )
         else:
             success = False
@@ -468,7 +544,10 @@ def main():
     if successful_jobs:
         show_job_status(workspace)
 
-    print(f"\n🎉 Workflow complete! Check {output_dir} for SVG files.")
+    if output_dir:
+        print(f"\n🎉 Workflow complete! Check {output_dir} for SVG files.")
+    else:
+        print("\n🎉 Workflow complete!")
     print(f"📋 vfab workspace: {workspace}")
 
 
@@ -1,5 +1,6 @@
 """Standalone usage example."""
 
+import shlex
 import subprocess
 import sys
 
@@ -8,21 +9,43 @@ def run_command(cmd, description):
     """Run a command and handle the result."""
     print(f"\n{'=' * 50}")
     print(f"Example: {description}")
-    print(f"Command: {cmd}")
+    print(f"Command: {shlex.join(cmd)}")
     print("=" * 50)
 
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+    # Stream output as it is produced instead of buffering it
+    with subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
+    ) as proc:
+        for line in proc.stdout:
+            print(line, end="")
+        returncode = proc.wait()
 
-    if result.returncode == 0:
+    if returncode == 0:
         print("✓ Success!")
-        if result.stdout:
-            print(result.stdout)
     else:
         print("✗ Error!")
-        if result.stderr:
-            print(result.stderr)
 
-    return result.returncode == 0
+    return returncode == 0
+
+
+def check_installation():
+    """Check that vpype is installed and exposes the vfab commands."""
+    print(f"\n{'=' * 50}")
+    print("Example: Checking vpype-vfab installation")
+    print("Command: vpype --help")
+    print("=" * 50)
+
+    try:
+        result = subprocess.run(
+            ["vpype", "--help"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+    except FileNotFoundError:
+        return False
+
+    return result.returncode == 0 and "vfab" in result.stdout
 
 
 def main():
@@ -31,48 +54,81 @@ def main():
     print("=====================================")
 
     # Check if vpype-vfab is available
-    if not run_command(
-        "vpype --help | grep plotty", "Checking vpype-vfab installation"
-    ):
+    if not check_installation():
         print("\n❌ vpype-vfab not found. Please install it first:")
         print("pipx inject vpype vpype-vfab")
         sys.exit(1)
 
     # Example 1: Create simple generative art and add to vfab
     run_command(
-        "vpype rand --seed 42 linemerge linesimplify reloop linesort vfab-add --name example_1 --preset fast",
+        [
+            "vpype",
+            "rand",
+            "--seed",
+            "42",
+            "linemerge",
+            "linesimplify",
+            "reloop",
+            "linesort",
+            "vfab-add",
+            "--name",
+            "example_1",
+            "--preset",
+            "fast",
+        ],
         "Create random art and add to vfab",
     )
 
     # Example 2: Create more complex art with high-quality preset
     run_command(
-        "vpype rand --seed 123 repeat 3 transform rotate 120 linemerge linesimplify reloop linesort vfab-add --name example_2 --preset hq --queue",
+        [
+            "vpype",
+            "rand",
+            "--seed",
+            "123",
+            "repeat",
+            "3",
+            "transform",
+            "rotate",
+            "120",
+            "linemerge",
+            "linesimplify",
+            "reloop",
+            "linesort",
+            "vfab-add",
+            "--name",
+            "example_2",
+            "--preset",
+            "hq",
+            "--queue",
+        ],
         "Create complex art with high-quality preset and auto-queue",
     )
 
     # Example 3: Check job status
-    run_command("vpype plotty-status", "Check all job statuses")
+    run_command(["vpype", "plotty-status"], "Check all job statuses")
 
     # Example 4: List queued jobs
     run_command(
-        "vpype vfab-list --state QUEUED --format table",
+        ["vpype", "vfab-list", "--state", "QUEUED", "--format", "table"],
         "List queued jobs in table format",
     )
 
     # Example 5: Check specific job
     run_command(
-        "vpype plotty-status --name example_1 --format json",
+        ["vpype", "plotty-status", "--name", "example_1", "--format", "json"],
         "Check specific job status in JSON format",
     )
 
     # Example 6: Queue a job manually
     run_command(
-        "vpype plotty-queue --name example_1 --priority 2", "Queue job with priority 2"
+        ["vpype", "plotty-queue", "--name", "example_1", "--priority", "2"],
+        "Queue job with priority 2",
     )
 
     # Example 7: List all jobs with limit
     run_command(
-        "vpype vfab-list --limit 5 --format table",
+        ["vpype", "vfab-list", "--limit", "5", "--format", "table"],
         "List up to 5 jobs in table format",
     )
 
@@ -1,5 +1,6 @@
 """vsketch integration example."""
 
+import numpy as np
 import vsketch
 
 
@@ -19,12 +20,12 @@ class MySketch(vsketch.SketchClass):
             radius = 0.5 + i * 0.8
             vsk.circle(10, 15, radius)
 
-        # Draw spiral pattern
-        for angle in range(0, 720, 5):
-            radius = angle / 100
-            x = 10 + radius * vsk.cos(angle)
-            y = 15 + radius * vsk.sin(angle)
-            vsk.point(x, y)
+        # Draw spiral pattern as a single polyline
+        angles = np.arange(0, 720, 5)
+        radii = angles / 100
+        x = 10 + radii * np.cos(np.radians(angles))
+        y = 15 + radii * np.sin(np.radians(angles))
+        vsk.polygon(x, y)
 
         # Add some random elements
         for _ in range(20):
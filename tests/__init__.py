@@ -1 +1,173 @@
 """Test configuration for vpype-vfab."""
+
+import base64
+import contextlib
+import io
+import json
+import pickle
+import queue
+import shlex
+import subprocess
+import sys
+import threading
+import traceback
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).parent.parent
+
+# Seconds a single worker command may run before the worker is replaced
+WORKER_TIMEOUT = 60
+
+
+def _load_document(layers, metadata):
+    """Rebuild a document serialized by :func:`_dump_document`."""
+    import vpype
+
+    document = vpype.Document(metadata=metadata)
+    for layer_id, (lines, layer_metadata) in layers.items():
+        document.add(
+            vpype.LineCollection(lines, metadata=layer_metadata),
+            layer_id,
+            with_metadata=True,
+        )
+    return document
+
+
+def _dump_document(document):
+    """Serialize a document for the worker as base64-encoded pickle.
+
+    Only the lines and metadata are pickled, never the document classes, which
+    other test modules may have replaced in ``sys.modules``.
+    """
+    layers = {
+        layer_id: (list(layer), layer.metadata)
+        for layer_id, layer in document.layers.items()
+    }
+    buffer = io.BytesIO()
+    pickler = pickle.Pickler(buffer)
+    pickler.dispatch_table = {
+        type(document): lambda doc: (_load_document, (layers, doc.metadata))
+    }
+    pickler.dump(document)
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def serve():
+    """Run vpype command lines read from stdin, one JSON request per line.
+
+    A request is ``[args, document]``, where ``document`` is ``null`` or a
+    base64-encoded pickled :class:`vpype.Document` that is preloaded into the
+    pipeline. Each reply is a JSON ``[returncode, stdout, stderr]`` line on stdout.
+    """
+    import click
+    from vpype_cli import cli, execute
+
+    # Commands get an empty stdin so prompts cannot read the request stream
+    requests, sys.stdin = sys.stdin, io.StringIO()
+    protocol = sys.stdout
+    for line in requests:
+        args, document = json.loads(line)
+        stdout, stderr = io.StringIO(), io.StringIO()
+
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                if document is None:
+                    cli.main(args, prog_name="vpype")
+                else:
+                    execute(shlex.join(args), pickle.loads(base64.b64decode(document)))
+                returncode = 0
+            except SystemExit as e:
+                returncode = e.code if isinstance(e.code, int) else int(bool(e.code))
+            except click.ClickException as e:
+                e.show()
+                returncode = e.exit_code
+            except Exception:
+                traceback.print_exc()
+                returncode = 1
+
+        protocol.write(
+            json.dumps([returncode, stdout.getvalue(), stderr.getvalue()]) + "\n"
+        )
+        protocol.flush()
+
+
+class VpypeWorker:
+    """Long-lived vpype process that runs one command line per request."""
+
+    def __init__(self):
+        """Initialize worker; the process starts on the first command."""
+        self._process = None
+        self._replies = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        """Start the worker process and a thread that queues its replies."""
+        self._process = subprocess.Popen(
+            [sys.executable, "-c", "from tests import serve; serve()"],
+            cwd=_REPO_ROOT,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        self._replies = queue.Queue()
+        threading.Thread(
+            target=self._read_replies,
+            args=(self._process.stdout, self._replies),
+            daemon=True,
+        ).start()
+
+    @staticmethod
+    def _read_replies(stdout, replies):
+        """Forward reply lines to the queue; an empty line means the worker died."""
+        for line in stdout:
+            replies.put(line)
+        replies.put("")
+
+    def _kill(self):
+        """Kill the worker process; the next command starts a fresh one."""
+        self._process.kill()
+        self._process.wait()
+        self._process = None
+
+    def run(self, args, document=None, timeout=WORKER_TIMEOUT):
+        """Run ``vpype <args>`` in the worker.
+
+        Args:
+            args: vpype arguments, without the leading ``vpype``
+            document: optional document preloaded into the pipeline, so it is
+                passed to the first command without an SVG round trip
+            timeout: seconds to wait for the command to finish
+
+        Returns:
+            CompletedProcess with the command's exit code and captured output
+
+        Raises:
+            subprocess.TimeoutExpired: if the command does not finish in time; the
+                worker is killed and replaced so later commands are unaffected
+        """
+        cmd = ["vpype", *args]
+        with self._lock:
+            if self._process is None:
+                self._start()
+            if document is not None:
+                document = _dump_document(document)
+            self._process.stdin.write(json.dumps([args, document]) + "\n")
+            self._process.stdin.flush()
+            try:
+                reply = self._replies.get(timeout=timeout)
+            except queue.Empty:
+                self._kill()
+                raise subprocess.TimeoutExpired(cmd, timeout) from None
+
+            if not reply:
+                self._kill()
+                raise RuntimeError("vpype worker exited unexpectedly")
+
+        returncode, stdout, stderr = json.loads(reply)
+        return subprocess.CompletedProcess(cmd, returncode, stdout, stderr)
+
+    def close(self):
+        """Stop the worker process, if it was started."""
+        if self._process is not None:
+            self._process.stdin.close()
+            self._process.wait()
@@ -1,10 +1,30 @@
 """Qt mocking utility for headless testing environment."""
 
 import os
+import shutil
+import subprocess
 import sys
 from unittest.mock import MagicMock
 from typing import Callable
 
+import pytest
+
+from tests import VpypeWorker
+
+# Qt modules replaced with mocks before they're imported
+QT_MODULES = (
+    "PySide6",
+    "PySide6.QtCore",
+    "PySide6.QtGui",
+    "PySide6.QtWidgets",
+    "PySide6.QtNetwork",
+    "shiboken6",
+    "shiboken6.Shiboken",
+)
+
+# Built once and shared by every test
+_QT_MOCKS = {module: MagicMock() for module in QT_MODULES}
+
 
 def setup_qt_mocks() -> None:
     """Set up Qt module mocks for headless testing.
@@ -18,18 +38,50 @@ def setup_qt_mocks() -> None:
     os.environ["PYQT_QPA_PLATFORM"] = "offscreen"
 
     # Mock Qt modules before they're imported
-    qt_modules = [
-        "PySide6",
-        "PySide6.QtCore",
-        "PySide6.QtGui",
-        "PySide6.QtWidgets",
-        "PySide6.QtNetwork",
-        "shiboken6",
-        "shiboken6.Shiboken",
-    ]
-
-    for module in qt_modules:
-        sys.modules[module] = MagicMock()
+    sys.modules.update(_QT_MOCKS)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def qt_mocks():
+    """Install Qt mocks once for the whole test session."""
+    setup_qt_mocks()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_qt_mocks(qt_mocks):
+    """Clear calls and configured behaviour on the shared Qt mocks after each test."""
+    yield
+    for mock in _QT_MOCKS.values():
+        mock.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture(scope="session")
+def warm_vpype():
+    """Run the vpype CLI once so later subprocess calls start from warm caches.
+
+    Requested by tests that spawn vpype. The warm-up run writes ``.pyc`` files
+    even if bytecode writing is disabled, and skips column-offset tables; the
+    test process environment is left untouched.
+    """
+    vpype = shutil.which("vpype")
+    if vpype is not None:
+        env = {**os.environ, "PYTHONNODEBUGRANGES": "1"}
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        subprocess.run(
+            [vpype, "--help"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=env,
+        )
+
+
+@pytest.fixture(scope="session")
+def vpype_worker(warm_vpype):
+    """One warm vpype process per session, so commands skip interpreter startup."""
+    worker = VpypeWorker()
+    yield worker
+    worker.close()
 
 
 def create_mocked_qt_test(test_function: Callable) -> Callable:
@@ -1,25 +1,38 @@
 """Test utilities for sandbox environment setup and management."""
 
 import functools
+import importlib
+import importlib.abc
+import importlib.util
+import io
 import sys
 from pathlib import Path
 
-# Add sandbox to Python path for all tests
-sandbox_dir = Path(__file__).parent.parent.parent / "sandbox"
-if sandbox_dir.exists():
+import pytest
+
+
+def _ensure_sandbox_on_path(sandbox_dir):
+    """Add the sandbox packages to the Python path."""
     sys.path.insert(0, str(sandbox_dir))
     sys.path.insert(0, str(sandbox_dir / "vsketch"))
     sys.path.insert(0, str(sandbox_dir / "plotty" / "src"))
 
 
+@functools.lru_cache(maxsize=1)
 def get_sandbox_config():
-    """Get sandbox configuration for tests."""
+    """Get sandbox configuration for tests.
+
+    The first call also makes the sandbox packages and vsketch examples
+    importable.
+    """
     sandbox_dir = Path(__file__).parent.parent.parent / "sandbox"
 
     if not sandbox_dir.exists():
         return None
 
-    return {
+    _ensure_sandbox_on_path(sandbox_dir)
+
+    config = {
         "sandbox_dir": sandbox_dir,
         "vsketch_dir": sandbox_dir / "vsketch",
         "plotty_dir": sandbox_dir / "plotty",
@@ -54,6 +67,44 @@ def get_sandbox_config():
         "plotty_presets": sandbox_dir / "plotty" / "config" / "vpype-presets.yaml",
     }
 
+    _install_sketch_finder(config)
+    return config
+
+
+# Example name -> (module name, sketch class name)
+_EXAMPLE_CLASSES = {
+    "schotter": ("sketch_schotter", "SchotterSketch"),
+    "quick_draw": ("sketch_quick_draw", "QuickDrawSketch"),
+    "random_lines": ("sketch_random_lines", "RandomLinesSketch"),
+    "polygons": ("sketch_polygons", "PolygonsSketch"),
+    "transforms": ("sketch_transforms", "TransformsSketch"),
+}
+
+
+class SandboxSketchFinder(importlib.abc.MetaPathFinder):
+    """Resolve sandbox vsketch example modules by name without touching sys.path."""
+
+    def __init__(self, modules):
+        """Initialize finder.
+
+        Args:
+            modules: Mapping of module name to sketch file path
+        """
+        self.modules = modules
+
+    def find_spec(self, fullname, path=None, target=None):
+        """Return a spec for known sketch modules, None for everything else."""
+        location = self.modules.get(fullname)
+        if location is None or not location.exists():
+            return None
+        return importlib.util.spec_from_file_location(fullname, location)
+
+
+def _install_sketch_finder(config):
+    """Register a finder for the sandbox vsketch examples."""
+    modules = {path.stem: path for path in config["vsketch_examples"].values()}
+    sys.meta_path.insert(0, SandboxSketchFinder(modules))
+
 
 def import_vsketch_example(example_name):
     """Import a vsketch example from sandbox."""
@@ -65,37 +116,20 @@ def import_vsketch_example(example_name):
     if not example_path or not example_path.exists():
         return None
 
-    # Add example directory to path
-    example_dir = example_path.parent
-    if str(example_dir) not in sys.path:
-        sys.path.insert(0, str(example_dir))
-
+    module_name, class_name = _EXAMPLE_CLASSES[example_name]
     try:
-        # Import the sketch class
-        if example_name == "schotter":
-            from sketch_schotter import SchotterSketch
-
-            return SchotterSketch()
-        elif example_name == "quick_draw":
-            from sketch_quick_draw import QuickDrawSketch
-
-            return QuickDrawSketch()
-        elif example_name == "random_lines":
-            from sketch_random_lines import RandomLinesSketch
-
-            return RandomLinesSketch()
-        elif example_name == "polygons":
-            from sketch_polygons import PolygonsSketch
-
-            return PolygonsSketch()
-        elif example_name == "transforms":
-            from sketch_transforms import TransformsSketch
-
-            return TransformsSketch()
+        module = importlib.import_module(module_name)
     except ImportError:
         return None
 
-    return None
+    return getattr(module, class_name)()
+
+
+@functools.lru_cache(maxsize=1)
+def _has_vsketch():
+    """Check whether vsketch can be imported, without importing it."""
+    get_sandbox_config()  # The sandbox may provide vsketch
+    return importlib.util.find_spec("vsketch") is not None
 
 
 def create_mock_plotty_workspace(workspace_dir):
@@ -141,6 +175,13 @@ logging:
     return workspace_path
 
 
+def render_svg(vsk):
+    """Render a vsketch sketch to SVG text in memory."""
+    buffer = io.StringIO()
+    vsk.save(buffer, format="svg")
+    return buffer.getvalue()
+
+
 def mock_quickdraw_data():
     """Create mock Quick Draw data for testing."""
     return {
@@ -157,10 +198,7 @@ def skip_if_no_sandbox(test_func):
 
     @functools.wraps(test_func)
     def wrapper(*args, **kwargs):
-        config = get_sandbox_config()
-        if not config:
-            import pytest
-
+        if get_sandbox_config() is None:
             pytest.skip("Sandbox environment not available")
         return test_func(*args, **kwargs)
 
@@ -169,17 +207,6 @@ def skip_if_no_sandbox(test_func):
 
 def skip_if_no_vsketch(test_func):
     """Decorator to skip tests if vsketch is not available."""
-
-    @functools.wraps(test_func)
-    def wrapper(*args, **kwargs):
-        try:
-            import vsketch
-
-            _ = vsketch  # Mark as used
-        except ImportError:
-            import pytest
-
-            pytest.skip("vsketch not available")
-        return test_func(*args, **kwargs)
-
-    return wrapper
+    return pytest.mark.skipif(not _has_vsketch(), reason="vsketch not available")(
+        test_func
+    )
@@ -0,0 +1,79 @@
+"""Shared fixtures for integration tests."""
+
+import shutil
+
+import pytest
+
+from tests.integration import create_mock_plotty_workspace, import_vsketch_example
+
+
+@pytest.fixture(scope="session")
+def workspace_template(tmp_path_factory):
+    """Build a mock vfab workspace once per session to copy from."""
+    return create_mock_plotty_workspace(tmp_path_factory.mktemp("workspace_template"))
+
+
+@pytest.fixture
+def workspace_dir(workspace_template, tmp_path):
+    """Create a fresh vfab workspace for a test from the session template."""
+    workspace = tmp_path / "workspace"
+    shutil.copytree(workspace_template, workspace)
+    return str(workspace)
+
+
+@pytest.fixture(scope="session")
+def vpype_bin(warm_vpype):
+    """Absolute path of the vpype executable, resolved once per session."""
+    path = shutil.which("vpype")
+    if path is None:
+        pytest.skip("vpype not installed")
+    return path
+
+
+@pytest.fixture(scope="session")
+def run_vpype(vpype_worker):
+    """Run vpype CLI commands in the shared worker, paying plugin discovery once."""
+    return vpype_worker.run
+
+
+@pytest.fixture(scope="session")
+def add_to_vfab(vpype_worker):
+    """Run vfab-add on an in-memory document, skipping the SVG round trip.
+
+    The document is handed to the shared vpype worker and preloaded into the
+    pipeline. Options are passed as keyword arguments, e.g. ``preset="hq"`` or
+    ``queue=True``.
+    """
+
+    def add(document, name, workspace, **options):
+        args = ["vfab-add", "--name", name]
+        for option, value in options.items():
+            flag = f"--{option.replace('_', '-')}"
+            args += [flag] if value is True else [flag, str(value)]
+        return vpype_worker.run([*args, "--workspace", workspace], document=document)
+
+    return add
+
+
+@pytest.fixture(scope="session")
+def vsketch_module():
+    """Import vsketch once per session."""
+    return pytest.importorskip("vsketch")
+
+
+def _sketch_class(example_name):
+    """Return the class of a sandbox vsketch example, or None if unavailable."""
+    sketch = import_vsketch_example(example_name)
+    return type(sketch) if sketch is not None else None
+
+
+@pytest.fixture(scope="session")
+def schotter_sketch_class():
+    """Schotter sketch class, imported once per session."""
+    return _sketch_class("schotter")
+
+
+@pytest.fixture(scope="session")
+def quickdraw_sketch_class():
+    """Quick Draw sketch class, imported once per session."""
+    return _sketch_class("quick_draw")
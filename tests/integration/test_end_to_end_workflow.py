@@ -1,40 +1,58 @@
 """End-to-end workflow validation tests for vpype-vfab."""
 
-import os
 import time
-import tempfile
 import subprocess
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from tests.integration import (
-    import_vsketch_example,
-    skip_if_no_sandbox,
-    skip_if_no_vsketch,
-)
+from tests.integration import skip_if_no_sandbox, skip_if_no_vsketch
+
+# Seconds a vpype subprocess may run before the test fails
+SUBPROCESS_TIMEOUT = 30
+
+# Single Quick Draw drawing returned by the mocked dataset
+_MOCK_DRAWING = {
+    "key_id": 1,
+    "country_code": b"US",
+    "recognized": 1,
+    "timestamp": 1234567890,
+    "image": [([10, 20, 30], [15, 25, 35])],
+}
+
+
+@pytest.fixture
+def quickdraw_mocks(quickdraw_sketch_class):
+    """Mock the Quick Draw dataset download with a 2x2 grid of drawings."""
+    if quickdraw_sketch_class is None:
+        yield None
+        return
+
+    with (
+        patch("urllib.request.urlretrieve"),
+        patch("sketch_quick_draw.unpack_drawings") as mock_unpack,
+    ):
+        mock_unpack.return_value = [_MOCK_DRAWING] * 4
+        yield mock_unpack
 
 
 class TestEndToEndWorkflow:
     """Test complete end-to-end workflows."""
 
-    @pytest.fixture
-    def workspace_dir(self):
-        """Create temporary workspace for testing."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            yield temp_dir
-
     @skip_if_no_sandbox
     @skip_if_no_vsketch
-    def test_complete_schotter_workflow(self, workspace_dir):
+    def test_complete_schotter_workflow(
+        self, workspace_dir, run_vpype, vsketch_module, schotter_sketch_class
+    ):
         """Test complete Schotter workflow: vsketch → vpype-vfab → vfab."""
-        import vsketch
+        workspace = Path(workspace_dir)
 
         # Step 1: Generate Schotter pattern with vsketch
-        schotter_sketch = import_vsketch_example("schotter")
-        assert schotter_sketch is not None, "Could not import Schotter sketch"
+        assert schotter_sketch_class is not None, "Could not import Schotter sketch"
+        schotter_sketch = schotter_sketch_class()
 
-        vsk = vsketch.Vsketch()
+        vsk = vsketch_module.Vsketch()
         schotter_sketch.draw(vsk)
 
         # Verify pattern generation
@@ -46,17 +64,15 @@ class TestEndToEndWorkflow:
         schotter_sketch.finalize(vsk)
 
         # Step 3: Save to SVG
-        svg_file = os.path.join(workspace_dir, "schotter_workflow.svg")
-        vsk.save(svg_file)
-        assert os.path.exists(svg_file)
-        assert os.path.getsize(svg_file) > 0
+        svg_file = workspace / "schotter_workflow.svg"
+        vsk.save(str(svg_file))
+        assert svg_file.stat().st_size > 0  # stat raises if the file is missing
 
         # Step 4: Add to vfab with vpype-vfab
-        result = subprocess.run(
+        result = run_vpype(
             [
-                "vpype",
                 "read",
-                svg_file,
+                str(svg_file),
                 "vfab-add",
                 "--name",
                 "schotter_workflow_test",
@@ -66,110 +82,95 @@ class TestEndToEndWorkflow:
                 "--workspace",
                 workspace_dir,
             ],
-            capture_output=True,
-            text=True,
         )
 
         assert result.returncode == 0
         assert "Job 'schotter_workflow_test' added to vfab" in result.stdout
 
         # Step 5: Check job status
-        result = subprocess.run(
+        result = run_vpype(
             [
-                "vpype",
                 "vfab-status",
                 "--name",
                 "schotter_workflow_test",
                 "--workspace",
                 workspace_dir,
             ],
-            capture_output=True,
-            text=True,
         )
 
         assert result.returncode == 0
         assert "schotter_workflow_test" in result.stdout
 
         # Step 6: List all jobs
-        result = subprocess.run(
+        result = run_vpype(
             [
-                "vpype",
                 "vfab-list",
                 "--format",
                 "json",
                 "--workspace",
                 workspace_dir,
             ],
-            capture_output=True,
-            text=True,
         )
 
         assert result.returncode == 0
 
     @skip_if_no_sandbox
     @skip_if_no_vsketch
-    def test_complete_quickdraw_workflow(self, workspace_dir):
+    def test_complete_quickdraw_workflow(
+        self,
+        workspace_dir,
+        run_vpype,
+        vsketch_module,
+        quickdraw_sketch_class,
+        quickdraw_mocks,
+    ):
         """Test complete Quick Draw workflow with batch processing."""
-        import vsketch
+        workspace = Path(workspace_dir)
 
         # Step 1: Generate Quick Draw pattern
-        quickdraw_sketch = import_vsketch_example("quick_draw")
-        assert quickdraw_sketch is not None, "Could not import Quick Draw sketch"
-
-        # Mock Quick Draw data download
-        with (
-            patch("urllib.request.urlretrieve"),
-            patch("sketch_quick_draw.unpack_drawings") as mock_unpack,
-        ):
-            mock_drawing = {
-                "key_id": 1,
-                "country_code": b"US",
-                "recognized": 1,
-                "timestamp": 1234567890,
-                "image": [([10, 20, 30], [15, 25, 35])],
-            }
-            mock_unpack.return_value = [mock_drawing] * 4  # 2x2 grid
-
-            vsk = vsketch.Vsketch()
-            quickdraw_sketch.columns = 2
-            quickdraw_sketch.rows = 2
-            quickdraw_sketch.layer_count = 1
-            quickdraw_sketch.draw(vsk)
-
-            # Step 2: Apply finalize
-            quickdraw_sketch.finalize(vsk)
-
-            # Step 3: Save and add to vfab
-            svg_file = os.path.join(workspace_dir, "quickdraw_workflow.svg")
-            vsk.save(svg_file)
-
-            result = subprocess.run(
-                [
-                    "vpype",
-                    "read",
-                    svg_file,
-                    "vfab-add",
-                    "--name",
-                    "quickdraw_workflow_test",
-                    "--preset",
-                    "default",
-                    "--queue",
-                    "--workspace",
-                    workspace_dir,
-                ],
-                capture_output=True,
-                text=True,
-            )
+        assert quickdraw_sketch_class is not None, "Could not import Quick Draw sketch"
+        quickdraw_sketch = quickdraw_sketch_class()
+
+        vsk = vsketch_module.Vsketch()
+        quickdraw_sketch.columns = 2
+        quickdraw_sketch.rows = 2
+        quickdraw_sketch.layer_count = 1
+        quickdraw_sketch.draw(vsk)
+
+        # Step 2: Apply finalize
+        quickdraw_sketch.finalize(vsk)
+
+        # Step 3: Save and add to vfab
+        svg_file = workspace / "quickdraw_workflow.svg"
+        vsk.save(str(svg_file))
 
-            assert result.returncode == 0
-            assert "Job 'quickdraw_workflow_test' added to vfab" in result.stdout
+        result = run_vpype(
+            [
+                "read",
+                str(svg_file),
+                "vfab-add",
+                "--name",
+                "quickdraw_workflow_test",
+                "--preset",
+                "default",
+                "--queue",
+                "--workspace",
+                workspace_dir,
+            ],
+        )
+
+        assert result.returncode == 0
+        assert "Job 'quickdraw_workflow_test' added to vfab" in result.stdout
 
     @skip_if_no_sandbox
-    def test_batch_processing_workflow(self, workspace_dir):
+    def test_batch_processing_workflow(self, workspace_dir, run_vpype):
         """Test batch processing of multiple sketches."""
+        workspace = Path(workspace_dir)
+
         # Create multiple simple SVG files for batch processing
         svg_files = []
         job_names = []
+        pipeline = []
 
         for i in range(3):
             svg_content = f"""<?xml version="1.0" encoding="utf-8" ?>
@@ -178,44 +179,41 @@ class TestEndToEndWorkflow:
 <circle cx="{50 + i * 5}" cy="{50 + i * 5}" r="20" fill="none" stroke="black" stroke-width="1"/>
 </svg>"""
 
-            svg_file = os.path.join(workspace_dir, f"batch_test_{i}.svg")
-            with open(svg_file, "w") as f:
-                f.write(svg_content)
+            svg_file = workspace / f"batch_test_{i}.svg"
+            svg_file.write_text(svg_content)
 
             svg_files.append(svg_file)
             job_name = f"batch_job_{i}"
             job_names.append(job_name)
 
-            # Add to vfab
-            result = subprocess.run(
-                [
-                    "vpype",
-                    "read",
-                    svg_file,
-                    "vfab-add",
-                    "--name",
-                    job_name,
-                    "--queue",
-                    "--workspace",
-                    workspace_dir,
-                ],
-                capture_output=True,
-                text=True,
-            )
+            # Each job reads its own file into an emptied document
+            pipeline += [
+                "read",
+                str(svg_file),
+                "vfab-add",
+                "--name",
+                job_name,
+                "--queue",
+                "--workspace",
+                workspace_dir,
+                "ldelete",
+                "all",
+            ]
+
+        # Add all jobs to vfab in a single vpype run
+        result = run_vpype(pipeline)
 
-            assert result.returncode == 0
+        assert result.returncode == 0
+        for job_name in job_names:
             assert f"Job '{job_name}' added to vfab" in result.stdout
 
         # Verify all jobs are in vfab
-        result = subprocess.run(
+        result = run_vpype(
             [
-                "vpype",
                 "vfab-list",
                 "--workspace",
                 workspace_dir,
             ],
-            capture_output=True,
-            text=True,
         )
 
         assert result.returncode == 0
@@ -223,8 +221,10 @@ class TestEndToEndWorkflow:
             assert job_name in result.stdout
 
     @skip_if_no_sandbox
-    def test_multilayer_pen_mapping_workflow(self, workspace_dir):
+    def test_multilayer_pen_mapping_workflow(self, workspace_dir, run_vpype):
         """Test workflow with multi-layer pen mapping."""
+        workspace = Path(workspace_dir)
+
         # Create multi-layer SVG
         svg_content = """<?xml version="1.0" encoding="utf-8" ?>
 <svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
@@ -239,81 +239,73 @@ class TestEndToEndWorkflow:
 </g>
 </svg>"""
 
-        svg_file = os.path.join(workspace_dir, "multilayer_test.svg")
-        with open(svg_file, "w") as f:
-            f.write(svg_content)
+        svg_file = workspace / "multilayer_test.svg"
+        svg_file.write_text(svg_content)
 
-        # Mock interactive pen mapping
-        with patch("vpype_vfab.commands._interactive_pen_mapping") as mock_mapping:
-            mock_mapping.return_value = {1: 1, 2: 2, 3: 3}
-
-            result = subprocess.run(
-                [
-                    "vpype",
-                    "read",
-                    svg_file,
-                    "vfab-add",
-                    "--name",
-                    "multilayer_test",
-                    "--workspace",
-                    workspace_dir,
-                ],
-                capture_output=True,
-                text=True,
-            )
+        # Layers are mapped to pens automatically
+        result = run_vpype(
+            [
+                "read",
+                str(svg_file),
+                "vfab-add",
+                "--name",
+                "multilayer_test",
+                "--workspace",
+                workspace_dir,
+            ],
+        )
 
-            assert result.returncode == 0
+        assert result.returncode == 0
 
     @skip_if_no_sandbox
-    def test_error_recovery_workflow(self, workspace_dir):
+    def test_error_recovery_workflow(self, workspace_dir, run_vpype):
         """Test workflow error recovery."""
+        workspace = Path(workspace_dir)
+
         # Test with invalid SVG
         invalid_svg = """<?xml version="1.0" encoding="utf-8" ?>
 <svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
 <invalid_element>This is not valid SVG</invalid_element>
 </svg>"""
 
-        svg_file = os.path.join(workspace_dir, "invalid_test.svg")
-        with open(svg_file, "w") as f:
-            f.write(invalid_svg)
+        svg_file = workspace / "invalid_test.svg"
+        svg_file.write_text(invalid_svg)
 
         # Should handle invalid SVG gracefully
-        result = subprocess.run(
+        result = run_vpype(
             [
-                "vpype",
                 "read",
-                svg_file,
+                str(svg_file),
                 "vfab-add",
                 "--name",
                 "invalid_test",
                 "--workspace",
                 workspace_dir,
             ],
-            capture_output=True,
-            text=True,
         )
 
         # May fail at vpype level, but shouldn't crash
         # The exact behavior depends on vpype's error handling
 
         # Test with non-existent vfab (should handle gracefully by creating fallback)
-        result = subprocess.run(
+        result = run_vpype(
             [
-                "vpype",
                 "vfab-status",
                 "--workspace",
                 "/tmp/definitely_nonexistent_path_12345",
             ],
-            capture_output=True,
-            text=True,
         )
 
         # Should handle missing workspace gracefully (either fails or creates fallback)
-        assert result.returncode == 0 or "error" in result.stdout.lower()
+        assert (
+            result.returncode == 0 or "error" in (result.stdout + result.stderr).lower()
+        )
 
     @skip_if_no_sandbox
-    def test_priority_queue_workflow(self, workspace_dir):
+    def test_priority_queue_workflow(self, workspace_dir, run_vpype):
         """Test priority queue workflow."""
+        workspace = Path(workspace_dir)
+
         # Create jobs with different priorities
         jobs = [
             {"name": "low_priority_job", "priority": 1},
@@ -326,113 +318,102 @@ class TestEndToEndWorkflow:
 <line x1="0" y1="0" x2="100" y2="100" stroke="black" stroke-width="1"/>
 </svg>"""
 
+        pipeline = []
         for job in jobs:
-            svg_file = os.path.join(workspace_dir, f"{job['name']}.svg")
-            with open(svg_file, "w") as f:
-                f.write(svg_content)
-
-            # Add job with priority
-            result = subprocess.run(
-                [
-                    "vpype",
-                    "read",
-                    svg_file,
-                    "vfab-add",
-                    "--name",
-                    job["name"],
-                    "--workspace",
-                    workspace_dir,
-                ],
-                capture_output=True,
-                text=True,
-            )
+            svg_file = workspace / f"{job['name']}.svg"
+            svg_file.write_text(svg_content)
 
-            assert result.returncode == 0
+            # Add job, then queue it with its priority
+            pipeline += [
+                "read",
+                str(svg_file),
+                "vfab-add",
+                "--name",
+                job["name"],
+                "--workspace",
+                workspace_dir,
+                "vfab-queue",
+                "--name",
+                job["name"],
+                "--priority",
+                str(job["priority"]),
+                "--workspace",
+                workspace_dir,
+                "ldelete",
+                "all",
+            ]
 
-            # Queue with priority
-            result = subprocess.run(
-                [
-                    "vpype",
-                    "vfab-queue",
-                    "--name",
-                    job["name"],
-                    "--priority",
-                    str(job["priority"]),
-                    "--workspace",
-                    workspace_dir,
-                ],
-                capture_output=True,
-                text=True,
-            )
+        result = run_vpype(pipeline)
 
-            assert result.returncode == 0
+        assert result.returncode == 0
 
         # Verify jobs are queued with priorities
-        result = subprocess.run(
+        result = run_vpype(
             [
-                "vpype",
                 "vfab-list",
                 "--state",
                 "QUEUED",
                 "--workspace",
                 workspace_dir,
             ],
-            capture_output=True,
-            text=True,
         )
 
         assert result.returncode == 0
 
     @skip_if_no_sandbox
-    def test_monitoring_integration_workflow(self, workspace_dir):
+    def test_monitoring_integration_workflow(self, workspace_dir, run_vpype, vpype_bin):
         """Test monitoring integration in workflow."""
+        workspace = Path(workspace_dir)
+
         # Create a job and monitor it
         svg_content = """<?xml version="1.0" encoding="utf-8" ?>
 <svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
 <rect x="10" y="10" width="80" height="80" fill="none" stroke="black" stroke-width="1"/>
 </svg>"""
 
-        svg_file = os.path.join(workspace_dir, "monitoring_test.svg")
-        with open(svg_file, "w") as f:
-            f.write(svg_content)
+        svg_file = workspace / "monitoring_test.svg"
+        svg_file.write_text(svg_content)
 
         # Add job
-        result = subprocess.run(
+        result = run_vpype(
             [
-                "vpype",
                 "read",
-                svg_file,
+                str(svg_file),
                 "vfab-add",
                 "--name",
                 "monitoring_test",
                 "--workspace",
                 workspace_dir,
             ],
-            capture_output=True,
-            text=True,
         )
 
         assert result.returncode == 0
 
-        # Test monitoring command (should not crash)
-        result = subprocess.run(
-            [
-                "vpype",
-                "vfab-monitor",
-                "--workspace",
-                workspace_dir,
-            ],
-            capture_output=True,
-            text=True,
-            timeout=5,  # Don't wait for interactive input
-        )
+        # Test monitoring command (should not crash); run as a real subprocess
+        # so a blocking monitor is bounded by the timeout
+        try:
+            subprocess.run(
+                [
+                    vpype_bin,
+                    "vfab-monitor",
+                    "--workspace",
+                    workspace_dir,
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=SUBPROCESS_TIMEOUT,  # Don't wait for interactive input
+            )
+        except subprocess.TimeoutExpired:
+            pytest.fail(f"vfab-monitor did not exit within {SUBPROCESS_TIMEOUT}s")
 
         # May fail due to no interactive mode, but shouldn't crash
         # The exact behavior depends on monitor implementation
 
     @skip_if_no_sandbox
-    def test_configuration_driven_workflow(self, workspace_dir):
+    def test_configuration_driven_workflow(self, workspace_dir, run_vpype):
         """Test workflow driven by configuration files."""
+        workspace = Path(workspace_dir)
+
         # Create vfab configuration
         config_content = """
 websocket:
@@ -452,9 +433,8 @@ presets:
     pen_height_down: 0
 """
 
-        config_file = os.path.join(workspace_dir, "config.yaml")
-        with open(config_file, "w") as f:
-            f.write(config_content)
+        config_file = workspace / "config.yaml"
+        config_file.write_text(config_content)
 
         # Create job using custom preset
         svg_content = """<?xml version="1.0" encoding="utf-8" ?>
@@ -462,15 +442,13 @@ presets:
 <circle cx="50" cy="50" r="30" fill="none" stroke="black" stroke-width="1"/>
 </svg>"""
 
-        svg_file = os.path.join(workspace_dir, "config_test.svg")
-        with open(svg_file, "w") as f:
-            f.write(svg_content)
+        svg_file = workspace / "config_test.svg"
+        svg_file.write_text(svg_content)
 
-        subprocess.run(
+        run_vpype(
             [
-                "vpype",
                 "read",
-                svg_file,
+                str(svg_file),
                 "vfab-add",
                 "--name",
                 "config_test",
@@ -479,43 +457,38 @@ presets:
                 "--workspace",
                 workspace_dir,
             ],
-            capture_output=True,
-            text=True,
         )
 
         # May fail if preset doesn't exist, but should handle gracefully
         # The exact behavior depends on preset validation
 
     @skip_if_no_sandbox
-    def test_performance_workflow(self, workspace_dir):
+    def test_performance_workflow(self, workspace_dir, run_vpype):
         """Test workflow performance with complex geometry."""
-        # Create complex SVG
-        paths = []
-        for i in range(50):  # 50 paths
-            path_data = (
-                f"M{i * 2},{i * 2} L{i * 2 + 10},{i * 2 + 10} L{i * 2 + 20},{i * 2} Z"
-            )
-            paths.append(
-                f'<path d="{path_data}" fill="none" stroke="black" stroke-width="0.5"/>'
-            )
+        workspace = Path(workspace_dir)
+
+        # Create complex SVG with 50 paths
+        paths = "\n".join(
+            f'<path d="M{i * 2},{i * 2} L{i * 2 + 10},{i * 2 + 10} '
+            f'L{i * 2 + 20},{i * 2} Z" fill="none" stroke="black" stroke-width="0.5"/>'
+            for i in range(50)
+        )
 
         svg_content = f"""<?xml version="1.0" encoding="utf-8" ?>
 <svg xmlns="http://www.w3.org/2000/svg" width="200" height="200">
-{chr(10).join(paths)}
+{paths}
 </svg>"""
 
-        svg_file = os.path.join(workspace_dir, "performance_test.svg")
-        with open(svg_file, "w") as f:
-            f.write(svg_content)
+        svg_file = workspace / "performance_test.svg"
+        svg_file.write_text(svg_content)
 
         # Measure processing time
         start_time = time.time()
 
-        result = subprocess.run(
+        result = run_vpype(
             [
-                "vpype",
                 "read",
-                svg_file,
+                str(svg_file),
                 "linemerge",
                 "linesimplify",
                 "vfab-add",
@@ -524,8 +497,6 @@ presets:
                 "--workspace",
                 workspace_dir,
             ],
-            capture_output=True,
-            text=True,
         )
 
         end_time = time.time()
@@ -535,50 +506,48 @@ presets:
         assert processing_time < 30.0  # Should complete within 30 seconds
 
     @skip_if_no_sandbox
-    def test_cleanup_workflow(self, workspace_dir):
+    def test_cleanup_workflow(self, workspace_dir, run_vpype):
         """Test workflow cleanup and resource management."""
+        workspace = Path(workspace_dir)
+
         # Create and add multiple jobs
         job_names = []
+        pipeline = []
         for i in range(3):
             svg_content = f"""<?xml version="1.0" encoding="utf-8" ?>
 <svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
 <text x="{i * 20}" y="50" font-family="Arial" font-size="12">Job {i}</text>
 </svg>"""
 
-            svg_file = os.path.join(workspace_dir, f"cleanup_test_{i}.svg")
-            with open(svg_file, "w") as f:
-                f.write(svg_content)
+            svg_file = workspace / f"cleanup_test_{i}.svg"
+            svg_file.write_text(svg_content)
 
             job_name = f"cleanup_test_{i}"
             job_names.append(job_name)
 
-            result = subprocess.run(
-                [
-                    "vpype",
-                    "read",
-                    svg_file,
-                    "vfab-add",
-                    "--name",
-                    job_name,
-                    "--workspace",
-                    workspace_dir,
-                ],
-                capture_output=True,
-                text=True,
-            )
+            pipeline += [
+                "read",
+                str(svg_file),
+                "vfab-add",
+                "--name",
+                job_name,
+                "--workspace",
+                workspace_dir,
+                "ldelete",
+                "all",
+            ]
+
+        result = run_vpype(pipeline)
 
-            assert result.returncode == 0
+        assert result.returncode == 0
 
         # Verify jobs exist
-        result = subprocess.run(
+        result = run_vpype(
             [
-                "vpype",
                 "vfab-list",
                 "--workspace",
                 workspace_dir,
             ],
-            capture_output=True,
-            text=True,
         )
 
         assert result.returncode == 0
@@ -1,39 +1,33 @@
 """Integration tests for Schotter sketch with vpype-vfab."""
 
-import os
-import sys
-import tempfile
+import copy
 import subprocess
 from pathlib import Path
-from unittest.mock import patch
 
 import pytest
 
-# Add sandbox/vsketch to path for importing vsketch examples
-vsketch_path = Path(__file__).parent.parent.parent / "sandbox" / "vsketch"
-if vsketch_path.exists():
-    sys.path.insert(0, str(vsketch_path))
-    sys.path.insert(0, str(vsketch_path / "examples" / "schotter"))
+from tests.integration import render_svg
 
+# Tests share the module workspace, so keep them on one xdist worker
+pytestmark = pytest.mark.xdist_group(name=__name__)
 
-class TestSchotterIntegration:
-    """Test Schotter sketch integration with vpype-vfab."""
 
-    @pytest.fixture
-    def schotter_sketch(self):
-        """Import Schotter sketch from temp vsketch."""
-        try:
-            from sketch_schotter import SchotterSketch
+@pytest.fixture(scope="session")
+def schotter_sketch(schotter_sketch_class):
+    """Pristine Schotter sketch; tests mutate a ``copy.copy`` of it."""
+    if schotter_sketch_class is None:
+        pytest.skip("Could not import Schotter sketch")
+    return schotter_sketch_class()
+
 
-            return SchotterSketch()
-        except ImportError as e:
-            pytest.skip(f"Could not import Schotter sketch: {e}")
+@pytest.fixture(scope="module")
+def workspace_dir(tmp_path_factory):
+    """Workspace shared by the module; tests use distinct job and file names."""
+    return str(tmp_path_factory.mktemp("schotter_ws"))
 
-    @pytest.fixture
-    def workspace_dir(self):
-        """Create temporary workspace for testing."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            yield temp_dir
+
+class TestSchotterIntegration:
+    """Test Schotter sketch integration with vpype-vfab."""
 
     def test_schotter_basic_generation(self, schotter_sketch, workspace_dir):
         """Test basic Schotter pattern generation."""
@@ -46,46 +40,51 @@ class TestSchotterIntegration:
         schotter_sketch.draw(vsk)
 
         # Verify document has content
-        assert len(vsk.document.layers) > 0
-        assert vsk.document.page_size is not None
+        document = vsk.document
+        layers = document.layers
+        assert layers
+        assert document.page_size is not None
 
         # Check that we have multiple squares (grid pattern)
-        total_paths = sum(len(layer) for layer in vsk.document.layers.values())
+        total_paths = sum(map(len, layers.values()))
         assert total_paths > 200  # 12x22 grid = 264 squares
 
-    def test_schotter_parameter_variations(self, workspace_dir):
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"columns": 6, "rows": 8, "fuzziness": 0.5},
+            {"columns": 15, "rows": 20, "fuzziness": 2.0},
+            {"columns": 3, "rows": 4, "fuzziness": 1.5},
+        ],
+    )
+    def test_schotter_parameter_variations(
+        self, schotter_sketch, workspace_dir, params
+    ):
         """Test Schotter with different parameter combinations."""
         try:
-            from sketch_schotter import SchotterSketch
             import vsketch
         except ImportError:
-            pytest.skip("Could not import Schotter sketch")
+            pytest.skip("vsketch not available")
 
-        # Test different parameter combinations
-        test_params = [
-            {"columns": 6, "rows": 8, "fuzziness": 0.5},
-            {"columns": 15, "rows": 20, "fuzziness": 2.0},
-            {"columns": 3, "rows": 4, "fuzziness": 1.5},
-        ]
-
-        for params in test_params:
-            vsk = vsketch.Vsketch()
-            sketch = SchotterSketch()
+        vsk = vsketch.Vsketch()
+        sketch = copy.copy(schotter_sketch)
 
-            # Set parameters
-            for key, value in params.items():
-                setattr(sketch, key, value)
+        # Set parameters
+        for key, value in params.items():
+            setattr(sketch, key, value)
 
-            # Generate pattern
-            sketch.draw(vsk)
+        # Generate pattern
+        sketch.draw(vsk)
 
-            # Verify grid size
-            expected_squares = params["columns"] * params["rows"]
-            total_paths = sum(len(layer) for layer in vsk.document.layers.values())
-            assert total_paths == expected_squares
+        # Verify grid size
+        expected_squares = params["columns"] * params["rows"]
+        total_paths = sum(map(len, vsk.document.layers.values()))
+        assert total_paths == expected_squares
 
-    def test_schotter_with_vpype_vfab_add(self, schotter_sketch, workspace_dir):
-        """Test adding Schotter sketch to vfab."""
+    def test_schotter_with_vpype_vfab_add(
+        self, vpype_bin, schotter_sketch, workspace_dir
+    ):
+        """Test adding Schotter sketch to vfab through the real vpype executable."""
         import vsketch
 
         # Create Schotter pattern
@@ -93,15 +92,15 @@ class TestSchotterIntegration:
         schotter_sketch.draw(vsk)
 
         # Save to SVG
-        svg_file = os.path.join(workspace_dir, "schotter.svg")
-        vsk.save(svg_file)
+        svg_file = Path(workspace_dir) / "schotter.svg"
+        vsk.save(str(svg_file))
 
-        # Add to vfab using vpype command
+        # Add to vfab using vpype command (smoke test of the CLI entry point)
         result = subprocess.run(
             [
-                "vpype",
+                vpype_bin,
                 "read",
-                svg_file,
+                str(svg_file),
                 "vfab-add",
                 "--name",
                 "schotter_test",
@@ -115,7 +114,9 @@ class TestSchotterIntegration:
         assert result.returncode == 0
         assert "Job 'schotter_test' added to vfab" in result.stdout
 
-    def test_schotter_with_different_presets(self, schotter_sketch, workspace_dir):
+    def test_schotter_with_different_presets(
+        self, add_to_vfab, schotter_sketch, workspace_dir
+    ):
         """Test Schotter with different vfab presets."""
         import vsketch
 
@@ -125,38 +126,21 @@ class TestSchotterIntegration:
             vsk = vsketch.Vsketch()
             schotter_sketch.draw(vsk)
 
-            # Save to SVG
-            svg_file = os.path.join(workspace_dir, f"schotter_{preset}.svg")
-            vsk.save(svg_file)
-
             # Add to vfab with preset
-            result = subprocess.run(
-                [
-                    "vpype",
-                    "read",
-                    svg_file,
-                    "vfab-add",
-                    "--name",
-                    f"schotter_{preset}",
-                    "--preset",
-                    preset,
-                    "--workspace",
-                    workspace_dir,
-                ],
-                capture_output=True,
-                text=True,
+            result = add_to_vfab(
+                vsk.document, f"schotter_{preset}", workspace_dir, preset=preset
             )
 
-            assert result.returncode == 0
             assert f"Job 'schotter_{preset}' added to vfab" in result.stdout
 
-    def test_schotter_batch_processing(self, workspace_dir):
+    def test_schotter_batch_processing(
+        self, run_vpype, add_to_vfab, schotter_sketch, workspace_dir
+    ):
         """Test batch processing of multiple Schotter variations."""
         try:
-            from sketch_schotter import SchotterSketch
             import vsketch
         except ImportError:
-            pytest.skip("Could not import Schotter sketch")
+            pytest.skip("vsketch not available")
 
         # Generate multiple Schotter variations
         variations = [
@@ -169,7 +153,7 @@ class TestSchotterIntegration:
 
         for i, params in enumerate(variations):
             vsk = vsketch.Vsketch()
-            sketch = SchotterSketch()
+            sketch = copy.copy(schotter_sketch)
 
             # Set parameters
             for key, value in params.items():
@@ -177,44 +161,24 @@ class TestSchotterIntegration:
 
             sketch.draw(vsk)
 
-            # Save and add to vfab
-            svg_file = os.path.join(workspace_dir, f"schotter_batch_{i}.svg")
-            vsk.save(svg_file)
-
             job_name = f"schotter_batch_{i}"
             job_names.append(job_name)
 
-            result = subprocess.run(
-                [
-                    "vpype",
-                    "read",
-                    svg_file,
-                    "vfab-add",
-                    "--name",
-                    job_name,
-                    "--queue",  # Auto-queue for batch processing
-                    "--workspace",
-                    workspace_dir,
-                ],
-                capture_output=True,
-                text=True,
-            )
+            # Auto-queue for batch processing
+            result = add_to_vfab(vsk.document, job_name, workspace_dir, queue=True)
 
-            assert result.returncode == 0
             assert f"Job '{job_name}' added to vfab" in result.stdout
 
         # Verify all jobs are in vfab
-        result = subprocess.run(
-            ["vpype", "vfab-list", "--workspace", workspace_dir],
-            capture_output=True,
-            text=True,
-        )
+        result = run_vpype(["vfab-list", "--workspace", workspace_dir])
 
         assert result.returncode == 0
         for job_name in job_names:
             assert job_name in result.stdout
 
-    def test_schotter_with_pen_mapping(self, schotter_sketch, workspace_dir):
+    def test_schotter_with_pen_mapping(
+        self, add_to_vfab, schotter_sketch, workspace_dir
+    ):
         """Test Schotter with multi-layer pen mapping."""
         import vsketch
         import vpype
@@ -242,56 +206,42 @@ class TestSchotterIntegration:
             else:
                 vsk.rect(i % 10, i // 10, 0.8, 0.8, layer=2)
 
-        # Save to SVG
-        svg_file = os.path.join(workspace_dir, "schotter_multilayer.svg")
-        vsk.save(svg_file)
-
-        # Test interactive pen mapping (mocked)
-        with patch("vpype_vfab.commands._interactive_pen_mapping") as mock_mapping:
-            mock_mapping.return_value = {1: 1, 2: 2}
-
-            result = subprocess.run(
-                [
-                    "vpype",
-                    "read",
-                    svg_file,
-                    "vfab-add",
-                    "--name",
-                    "schotter_multilayer",
-                    "--workspace",
-                    workspace_dir,
-                ],
-                capture_output=True,
-                text=True,
-            )
+        # Layers are mapped to pens automatically
+        result = add_to_vfab(vsk.document, "schotter_multilayer", workspace_dir)
 
-            assert result.returncode == 0
+        assert "Job 'schotter_multilayer' added to vfab" in result.stdout
 
-    def test_schotter_error_handling(self, workspace_dir):
-        """Test error handling with Schotter sketch."""
+    @pytest.mark.slow
+    def test_schotter_extreme_parameters(self, schotter_sketch, workspace_dir):
+        """Test Schotter with a very large, very fuzzy grid (10,000 squares)."""
         try:
-            from sketch_schotter import SchotterSketch
             import vsketch
         except ImportError:
-            pytest.skip("Could not import Schotter sketch")
+            pytest.skip("vsketch not available")
 
-        # Test with invalid parameters
         vsk = vsketch.Vsketch()
-        sketch = SchotterSketch()
+        sketch = copy.copy(schotter_sketch)
 
         # Set extreme parameters that might cause issues
         sketch.columns = 100  # Very large
         sketch.rows = 100  # Very large
         sketch.fuzziness = 10  # Very high fuzziness
 
-        # This should still work but might be slow
         sketch.draw(vsk)
 
         # Verify it doesn't crash
-        assert len(vsk.document.layers) > 0
+        assert vsk.document.layers
+
+    def test_schotter_error_handling(self, schotter_sketch, workspace_dir):
+        """Test error handling with Schotter sketch."""
+        try:
+            import vsketch
+        except ImportError:
+            pytest.skip("vsketch not available")
 
         # Test with zero parameters
         vsk = vsketch.Vsketch()
+        sketch = copy.copy(schotter_sketch)
         sketch.columns = 0
         sketch.rows = 0
         sketch.draw(vsk)
@@ -299,7 +249,9 @@ class TestSchotterIntegration:
         # Should handle gracefully
         assert len(vsk.document.layers) >= 0
 
-    def test_schotter_finalize_integration(self, schotter_sketch, workspace_dir):
+    def test_schotter_finalize_integration(
+        self, monkeypatch, add_to_vfab, schotter_sketch, workspace_dir
+    ):
         """Test Schotter finalize method with vpype-vfab."""
         import vsketch
 
@@ -307,34 +259,19 @@ class TestSchotterIntegration:
         vsk = vsketch.Vsketch()
         schotter_sketch.draw(vsk)
 
-        # Apply finalize (which includes vpype optimization)
+        # Record finalize's vpype optimization pipeline instead of running it;
+        # test_quickdraw_finalize_integration runs the real pass
+        pipelines = []
+        monkeypatch.setattr(vsk, "vpype", pipelines.append)
         schotter_sketch.finalize(vsk)
+        assert pipelines
 
-        # Save to SVG
-        svg_file = os.path.join(workspace_dir, "schotter_finalized.svg")
-        vsk.save(svg_file)
+        # Verify the finalized sketch renders to SVG
+        assert render_svg(vsk)
 
-        # Verify file exists and is valid
-        assert os.path.exists(svg_file)
-        assert os.path.getsize(svg_file) > 0
-
-        # Add to vfab
-        result = subprocess.run(
-            [
-                "vpype",
-                "read",
-                svg_file,
-                "vfab-add",
-                "--name",
-                "schotter_finalized",
-                "--preset",
-                "hq",  # High quality for finalized sketch
-                "--workspace",
-                workspace_dir,
-            ],
-            capture_output=True,
-            text=True,
+        # Add to vfab (high quality for finalized sketch)
+        result = add_to_vfab(
+            vsk.document, "schotter_finalized", workspace_dir, preset="hq"
         )
 
-        assert result.returncode == 0
         assert "Job 'schotter_finalized' added to vfab" in result.stdout
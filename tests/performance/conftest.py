@@ -0,0 +1,9 @@
+"""Shared fixtures for performance tests."""
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def shared_workspace(tmp_path_factory):
+    """Workspace shared by the tests of a module that use distinct job names."""
+    return str(tmp_path_factory.mktemp("vfab_workspace"))
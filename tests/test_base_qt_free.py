@@ -2,8 +2,11 @@
 
 import sys
 import os
+from types import SimpleNamespace
 from unittest.mock import Mock
 
+import pytest
+
 # Add the project root to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
@@ -17,78 +20,48 @@ from vpype_vfab import base
 class TestBaseQtFree:
     """Qt-free test suite for base module."""
 
-    def test_get_pen_mapping_single_layer(self):
-        """Test pen mapping for single layer document."""
-        command = base.StreamlinedVfabCommand()
-        document = Mock()
-        document.layers = [0]  # Single layer
-
-        result = command.get_pen_mapping(document)
-
-        assert result is None
-
-    def test_get_pen_mapping_auto_preset(self):
-        """Test pen mapping with auto preset."""
-        command = base.StreamlinedVfabCommand()
-        document = Mock()
-        document.layers = [0, 1, 2, 3, 4, 5]  # Multiple layers
-
-        result = command.get_pen_mapping(document, "auto")
-
-        expected = {0: 1, 1: 2, 2: 3, 3: 4, 4: 1, 5: 2}
-        assert result == expected
-
-    def test_get_pen_mapping_sequential_preset(self):
-        """Test pen mapping with sequential preset."""
-        command = base.StreamlinedVfabCommand()
-        document = Mock()
-        document.layers = [0, 1, 2, 3]  # Multiple layers
-
-        result = command.get_pen_mapping(document, "sequential")
-
-        expected = {0: 1, 1: 2, 2: 3, 3: 4}
-        assert result == expected
-
-    def test_get_pen_mapping_default_preset(self):
-        """Test pen mapping with unknown preset (defaults to auto)."""
-        command = base.StreamlinedVfabCommand()
-        document = Mock()
-        document.layers = [0, 1, 2, 3, 4]  # Multiple layers
-
-        result = command.get_pen_mapping(document, "unknown")
-
-        expected = {0: 1, 1: 2, 2: 3, 3: 4, 4: 1}
-        assert result == expected
-
-    def test_get_pen_mapping_default_parameter(self):
-        """Test pen mapping with default parameter (auto)."""
-        command = base.StreamlinedVfabCommand()
-        document = Mock()
-        document.layers = [0, 1, 2]  # Multiple layers
-
-        result = command.get_pen_mapping(document)  # No preset specified
-
-        expected = {0: 1, 1: 2, 2: 3}
-        assert result == expected
-
-    def test_get_pen_mapping_empty_layers(self):
-        """Test pen mapping with empty layers list."""
-        command = base.StreamlinedVfabCommand()
-        document = Mock()
-        document.layers = []  # No layers
-
-        result = command.get_pen_mapping(document)
-
-        assert result is None
-
-    def test_get_pen_mapping_many_layers_auto(self):
-        """Test pen mapping with many layers using auto preset."""
+    @pytest.mark.parametrize(
+        "layers, preset, expected",
+        [
+            pytest.param([0], None, None, id="single_layer"),
+            pytest.param(
+                [0, 1, 2, 3, 4, 5],
+                "auto",
+                {0: 1, 1: 2, 2: 3, 3: 4, 4: 1, 5: 2},
+                id="auto_preset",
+            ),
+            pytest.param(
+                [0, 1, 2, 3],
+                "sequential",
+                {0: 1, 1: 2, 2: 3, 3: 4},
+                id="sequential_preset",
+            ),
+            # Unknown presets fall back to auto
+            pytest.param(
+                [0, 1, 2, 3, 4],
+                "unknown",
+                {0: 1, 1: 2, 2: 3, 3: 4, 4: 1},
+                id="default_preset",
+            ),
+            pytest.param([0, 1, 2], None, {0: 1, 1: 2, 2: 3}, id="default_parameter"),
+            pytest.param([], None, None, id="empty_layers"),
+            # Auto cycles through pens 1-4
+            pytest.param(
+                list(range(10)),
+                "auto",
+                {i: (i % 4) + 1 for i in range(10)},
+                id="many_layers_auto",
+            ),
+        ],
+    )
+    def test_get_pen_mapping(self, layers, preset, expected):
+        """Test pen mapping for each layer layout and preset."""
         command = base.StreamlinedVfabCommand()
-        document = Mock()
-        document.layers = list(range(10))  # 10 layers
+        document = SimpleNamespace(layers=layers)
 
-        result = command.get_pen_mapping(document, "auto")
+        if preset is None:
+            result = command.get_pen_mapping(document)
+        else:
+            result = command.get_pen_mapping(document, preset)
 
-        # Should cycle through pens 1-4
-        expected = {i: (i % 4) + 1 for i in range(10)}
         assert result == expected
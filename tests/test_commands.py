@@ -1,387 +1,255 @@
 """Test vpype commands."""
 
-import os
-import subprocess
-import tempfile
+from pathlib import Path
+from unittest.mock import patch
 
+import numpy as np
+import pytest
+import vpype
+from vpype import Document
+from vpype.model import LineCollection
 
-def create_test_svg() -> str:
-    """Create a simple test SVG file."""
-    return """<?xml version="1.0" encoding="utf-8" ?>
+# Simple test SVG, pre-encoded so writing it skips the text codec
+_SVG_BYTES = b"""<?xml version="1.0" encoding="utf-8" ?>
 <svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
 <line x1="0" y1="0" x2="100" y2="100" stroke="black" stroke-width="1"/>
 </svg>"""
 
 
+@pytest.fixture(scope="session")
+def shared_svg(tmp_path_factory):
+    """Write the test SVG once per session; vpype only reads it."""
+    svg_file = tmp_path_factory.mktemp("svg") / "test.svg"
+    svg_file.write_bytes(_SVG_BYTES)
+    return str(svg_file)
+
+
+@pytest.fixture(scope="class")
+def two_layer_doc():
+    """Document with a red layer 1 and a green layer 2."""
+    document = Document()
+
+    lc1 = LineCollection()
+    lc1.append(np.array([[0, 0], [10, 10]], dtype=np.float64))
+    lc1.set_property(vpype.METADATA_FIELD_COLOR, "#ff0000")  # Red
+    document.layers[1] = lc1
+
+    lc2 = LineCollection()
+    lc2.append(np.array([[0, 0], [20, 20]], dtype=np.float64))
+    lc2.set_property(vpype.METADATA_FIELD_COLOR, "#00ff00")  # Green
+    document.layers[2] = lc2
+
+    return document
+
+
 class TestCommands:
     """Test vpype commands."""
 
-    def test_vfab_add_basic(self):
+    def test_vfab_add_basic(self, vpype_worker, shared_svg, tmp_path):
         """Test basic vfab-add command."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            svg_file = os.path.join(temp_dir, "test.svg")
-            with open(svg_file, "w") as f:
-                f.write(create_test_svg())
-
-            result = subprocess.run(
-                [
-                    "vpype",
-                    "read",
-                    svg_file,
-                    "vfab-add",
-                    "--name",
-                    "test_job",
-                    "--workspace",
-                    temp_dir,
-                ],
-                capture_output=True,
-                text=True,
-            )
-
-            assert result.returncode == 0
-            assert "Job 'test_job' added to vfab" in result.stdout
-
-    def test_vfab_add_with_queue(self):
+        temp_dir = str(tmp_path)
+        result = vpype_worker.run(
+            [
+                "read",
+                shared_svg,
+                "vfab-add",
+                "--name",
+                "test_job",
+                "--workspace",
+                temp_dir,
+            ]
+        )
+
+        assert result.returncode == 0
+        assert "Job 'test_job' added to vfab" in result.stdout
+
+    def test_vfab_add_with_queue(self, vpype_worker, shared_svg, tmp_path):
         """Test vfab-add command with queue option."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            svg_file = os.path.join(temp_dir, "test.svg")
-            with open(svg_file, "w") as f:
-                f.write(create_test_svg())
-
-            result = subprocess.run(
-                [
-                    "vpype",
-                    "read",
-                    svg_file,
-                    "vfab-add",
-                    "--name",
-                    "test_job",
-                    "--queue",
-                    "--workspace",
-                    temp_dir,
-                ],
-                capture_output=True,
-                text=True,
-            )
-
-            assert result.returncode == 0
-            assert "Job 'test_job' added to vfab" in result.stdout
-            assert "queued" in result.stdout.lower()
+        temp_dir = str(tmp_path)
+        result = vpype_worker.run(
+            [
+                "read",
+                shared_svg,
+                "vfab-add",
+                "--name",
+                "test_job",
+                "--queue",
+                "--workspace",
+                temp_dir,
+            ]
+        )
+
+        assert result.returncode == 0
+        assert "Job 'test_job' added to vfab" in result.stdout
+        assert "queued" in result.stdout.lower()
 
     def test_vfab_add_auto_name(self):
-        """Test vfab-add command with auto-generated name."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            svg_file = os.path.join(temp_dir, "test.svg")
-            with open(svg_file, "w") as f:
-                f.write(create_test_svg())
-
-            result = subprocess.run(
-                ["vpype", "read", svg_file, "vfab-add", "--workspace", temp_dir],
-                capture_output=True,
-                text=True,
-            )
-
-            assert result.returncode == 0
-            assert "Job 'vpype_job_" in result.stdout
-
-    def test_vfab_add_invalid_preset(self):
+        """Test the auto-generated job name used by vfab-add."""
+        # Imported late: other test modules swap in mocked modules at collection
+        from vpype_vfab.utils import generate_job_name
+
+        assert generate_job_name(Document()).startswith("vpype_job_")
+
+    def test_vfab_add_invalid_preset(self, vpype_worker, shared_svg, tmp_path):
         """Test vfab-add command with invalid preset."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            svg_file = os.path.join(temp_dir, "test.svg")
-            with open(svg_file, "w") as f:
-                f.write(create_test_svg())
-
-            result = subprocess.run(
-                [
-                    "vpype",
-                    "read",
-                    svg_file,
-                    "vfab-add",
-                    "--name",
-                    "test_job",
-                    "--preset",
-                    "invalid",
-                    "--workspace",
-                    temp_dir,
-                ],
-                capture_output=True,
-                text=True,
-            )
-
-            assert result.returncode != 0
-
-    def test_vfab_queue_basic(self):
+        temp_dir = str(tmp_path)
+        result = vpype_worker.run(
+            [
+                "read",
+                shared_svg,
+                "vfab-add",
+                "--name",
+                "test_job",
+                "--preset",
+                "invalid",
+                "--workspace",
+                temp_dir,
+            ]
+        )
+
+        assert result.returncode != 0
+
+    def test_vfab_queue_basic(self, vpype_worker, shared_svg, tmp_path):
         """Test basic vfab-queue command."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # First create a job
-            svg_file = os.path.join(temp_dir, "test.svg")
-            with open(svg_file, "w") as f:
-                f.write(create_test_svg())
-
-            # Add job first
-            subprocess.run(
-                [
-                    "vpype",
-                    "read",
-                    svg_file,
-                    "vfab-add",
-                    "--name",
-                    "test_job",
-                    "--workspace",
-                    temp_dir,
-                ],
-                capture_output=True,
-                text=True,
-            )
-
-            # Then queue it
-            result = subprocess.run(
-                [
-                    "vpype",
-                    "vfab-queue",
-                    "--name",
-                    "test_job",
-                    "--workspace",
-                    temp_dir,
-                ],
-                capture_output=True,
-                text=True,
-            )
-
-            assert result.returncode == 0
-            assert "Job 'test_job' queued" in result.stdout
-
-    def test_vfab_queue_with_priority(self):
+        temp_dir = str(tmp_path)
+
+        # Add the job and queue it in one pipeline
+        result = vpype_worker.run(
+            ["read", shared_svg]
+            + ["vfab-add", "--name", "test_job", "--workspace", temp_dir]
+            + ["vfab-queue", "--name", "test_job", "--workspace", temp_dir]
+        )
+
+        assert result.returncode == 0
+        assert "Job 'test_job' queued" in result.stdout
+
+    def test_vfab_queue_with_priority(self, vpype_worker, shared_svg, tmp_path):
         """Test vfab-queue command with priority."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            svg_file = os.path.join(temp_dir, "test.svg")
-            with open(svg_file, "w") as f:
-                f.write(create_test_svg())
-
-            # Add job first
-            subprocess.run(
-                [
-                    "vpype",
-                    "read",
-                    svg_file,
-                    "vfab-add",
-                    "--name",
-                    "test_job",
-                    "--workspace",
-                    temp_dir,
-                ],
-                capture_output=True,
-                text=True,
-            )
-
-            # Then queue with priority
-            result = subprocess.run(
-                [
-                    "vpype",
-                    "vfab-queue",
-                    "--name",
-                    "test_job",
-                    "--priority",
-                    "5",
-                    "--workspace",
-                    temp_dir,
-                ],
-                capture_output=True,
-                text=True,
-            )
-
-            assert result.returncode == 0
-
-    def test_vfab_status_specific_job(self):
+        temp_dir = str(tmp_path)
+
+        # Add the job and queue it with priority in one pipeline
+        result = vpype_worker.run(
+            ["read", shared_svg]
+            + ["vfab-add", "--name", "test_job", "--workspace", temp_dir]
+            + ["vfab-queue", "--name", "test_job", "--priority", "5"]
+            + ["--workspace", temp_dir]
+        )
+
+        assert result.returncode == 0
+
+    def test_vfab_status_specific_job(self, vpype_worker, shared_svg, tmp_path):
         """Test vfab-status command for specific job."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            svg_file = os.path.join(temp_dir, "test.svg")
-            with open(svg_file, "w") as f:
-                f.write(create_test_svg())
-
-            # Add job first
-            subprocess.run(
-                [
-                    "vpype",
-                    "read",
-                    svg_file,
-                    "vfab-add",
-                    "--name",
-                    "test_job",
-                    "--workspace",
-                    temp_dir,
-                ],
-                capture_output=True,
-                text=True,
-            )
-
-            # Check status
-            result = subprocess.run(
-                [
-                    "vpype",
-                    "vfab-status",
-                    "--name",
-                    "test_job",
-                    "--workspace",
-                    temp_dir,
-                ],
-                capture_output=True,
-                text=True,
-            )
-
-            assert result.returncode == 0
-
-    def test_vfab_status_all_jobs(self):
+        temp_dir = str(tmp_path)
+
+        # Add the job and check its status in one pipeline
+        result = vpype_worker.run(
+            ["read", shared_svg]
+            + ["vfab-add", "--name", "test_job", "--workspace", temp_dir]
+            + ["vfab-status", "--name", "test_job", "--workspace", temp_dir]
+        )
+
+        assert result.returncode == 0
+
+    def test_vfab_status_all_jobs(self, vpype_worker, tmp_path):
         """Test vfab-status command for all jobs."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            result = subprocess.run(
-                ["vpype", "vfab-status", "--workspace", temp_dir],
-                capture_output=True,
-                text=True,
-            )
-
-            assert result.returncode == 0
-
-    def test_vfab_list_basic(self):
-        """Test basic vfab-list command."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            result = subprocess.run(
-                ["vpype", "vfab-list", "--workspace", temp_dir],
-                capture_output=True,
-                text=True,
-            )
-
-            assert result.returncode == 0
-
-    def test_vfab_list_with_state_filter(self):
-        """Test vfab-list command with state filter."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            result = subprocess.run(
-                ["vpype", "vfab-list", "--state", "QUEUED", "--workspace", temp_dir],
-                capture_output=True,
-                text=True,
-            )
-
-            assert result.returncode == 0
-
-    def test_vfab_list_with_limit(self):
-        """Test vfab-list command with limit."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            result = subprocess.run(
-                ["vpype", "vfab-list", "--limit", "5", "--workspace", temp_dir],
-                capture_output=True,
-                text=True,
-            )
-
-            assert result.returncode == 0
-
-    def test_vfab_list_json_format(self):
-        """Test vfab-list command with JSON output."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            result = subprocess.run(
-                ["vpype", "vfab-list", "--format", "json", "--workspace", temp_dir],
-                capture_output=True,
-                text=True,
-            )
-
-            assert result.returncode == 0
-
-    def test_interactive_pen_mapping_function(self):
+        temp_dir = str(tmp_path)
+        result = vpype_worker.run(["vfab-status", "--workspace", temp_dir])
+
+        assert result.returncode == 0
+
+    @pytest.mark.parametrize(
+        "extra_args",
+        [
+            pytest.param([], id="basic"),
+            pytest.param(["--state", "QUEUED"], id="state_filter"),
+            pytest.param(["--limit", "5"], id="limit"),
+            pytest.param(["--format", "json"], id="json_format"),
+        ],
+    )
+    def test_vfab_list(self, vpype_worker, tmp_path, extra_args):
+        """Test vfab-list command with various options."""
+        result = vpype_worker.run(
+            ["vfab-list", *extra_args, "--workspace", str(tmp_path)]
+        )
+
+        assert result.returncode == 0
+
+    def test_vfab_list_name_only(self, vpype_worker, tmp_path):
+        """Test vfab-list command printing only job names."""
+        temp_dir = str(tmp_path)
+        vpype_worker.run(
+            ["rect", "0", "0", "10", "10"]
+            + ["vfab-add", "--name", "name_only_job", "--workspace", temp_dir]
+        )
+        result = vpype_worker.run(["vfab-list", "--name-only", "--workspace", temp_dir])
+
+        assert result.returncode == 0
+        assert result.stdout.splitlines() == ["name_only_job"]
+
+    def test_interactive_pen_mapping_function(self, tmp_path, two_layer_doc):
         """Test the _interactive_pen_mapping function directly."""
-        import tempfile
-        from pathlib import Path
-        from unittest.mock import patch
-        import numpy as np
-        import vpype
-        from vpype import Document
-        from vpype.model import LineCollection
+        # Imported late: other test modules swap in mocked modules at collection
         from vpype_vfab.commands import _interactive_pen_mapping
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create a test document with multiple layers
-            document = Document()
-
-            # Create layer 1 with red color
-            lc1 = LineCollection()
-            lc1.append(np.array([[0, 0], [10, 10]]))
-            lc1.set_property(vpype.METADATA_FIELD_COLOR, "#ff0000")  # Red
-            document.layers[1] = lc1
+        temp_dir = str(tmp_path)
 
-            # Create layer 2 with green color
-            lc2 = LineCollection()
-            lc2.append(np.array([[0, 0], [20, 20]]))
-            lc2.set_property(vpype.METADATA_FIELD_COLOR, "#00ff00")  # Green
-            document.layers[2] = lc2
+        # Mock user input for pen selection
+        with patch("click.prompt", side_effect=[1, 2]):
+            pen_mapping = _interactive_pen_mapping(two_layer_doc, "test_job", temp_dir)
 
-            # Mock user input for pen selection
-            with patch("click.prompt", side_effect=[1, 2]):
-                pen_mapping = _interactive_pen_mapping(document, "test_job", temp_dir)
+            assert pen_mapping == {1: 1, 2: 2}
 
-                assert pen_mapping == {1: 1, 2: 2}
+            # Check that pen mapping file was created
+            pen_mapping_file = Path(temp_dir) / "pen_mappings.yaml"
+            assert pen_mapping_file.exists()
 
-                # Check that pen mapping file was created
-                pen_mapping_file = Path(temp_dir) / "pen_mappings.yaml"
-                assert pen_mapping_file.exists()
-
-    def test_interactive_pen_mapping_single_layer(self):
+    def test_interactive_pen_mapping_single_layer(self, tmp_path):
         """Test interactive pen mapping with single layer document."""
-        import tempfile
-        from vpype import Document
+        # Imported late: other test modules swap in mocked modules at collection
         from vpype_vfab.commands import _interactive_pen_mapping
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create a document with single layer
-            document = Document()
+        temp_dir = str(tmp_path)
+
+        # Create a document with single layer
+        document = Document()
 
-            pen_mapping = _interactive_pen_mapping(document, "test_job", temp_dir)
+        pen_mapping = _interactive_pen_mapping(document, "test_job", temp_dir)
 
-            # Should return default mapping for single layer (layer 0 when no layers)
-            assert pen_mapping == {0: 1}
+        # Should return default mapping for single layer (layer 0 when no layers)
+        assert pen_mapping == {0: 1}
 
-    def test_vfab_queue_with_interactive_pen_mapping(self):
+    def test_vfab_queue_with_interactive_pen_mapping(
+        self, vpype_worker, shared_svg, tmp_path
+    ):
         """Test vfab-queue command after adding job with interactive pen mapping."""
-        from unittest.mock import patch
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            svg_file = os.path.join(temp_dir, "test.svg")
-            with open(svg_file, "w") as f:
-                f.write(create_test_svg())
-
-            # Mock the interactive pen mapping to avoid user input
-            with patch("vpype_vfab.commands._interactive_pen_mapping") as mock_mapping:
-                mock_mapping.return_value = {1: 1}
-
-                # Add job with interactive pen mapping
-                add_result = subprocess.run(
-                    [
-                        "vpype",
-                        "read",
-                        svg_file,
-                        "vfab-add",
-                        "--name",
-                        "test_job",
-                        "--pen-mapping",
-                        "interactive",
-                        "--workspace",
-                        temp_dir,
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-                assert add_result.returncode == 0
-
-            # Queue the job (no interactive option needed for queue)
-            result = subprocess.run(
-                [
-                    "vpype",
-                    "vfab-queue",
-                    "--name",
-                    "test_job",
-                    "--workspace",
-                    temp_dir,
-                ],
-                capture_output=True,
-                text=True,
-            )
-
-            assert result.returncode == 0
+        temp_dir = str(tmp_path)
+
+        # Single-layer SVG, so interactive mapping picks pen 1 without prompting
+        add_result = vpype_worker.run(
+            [
+                "read",
+                shared_svg,
+                "vfab-add",
+                "--name",
+                "test_job",
+                "--pen-mapping",
+                "interactive",
+                "--workspace",
+                temp_dir,
+            ]
+        )
+        assert add_result.returncode == 0
+        assert "Single layer detected" in add_result.stdout
+
+        # Queue the job (no interactive option needed for queue)
+        result = vpype_worker.run(
+            [
+                "vfab-queue",
+                "--name",
+                "test_job",
+                "--workspace",
+                temp_dir,
+            ]
+        )
+
+        assert result.returncode == 0
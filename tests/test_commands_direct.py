@@ -14,7 +14,7 @@ os.environ["DISPLAY"] = ""
 os.environ["QT_QPA_PLATFORM"] = "offscreen"
 
 # Add project root to path
-sys.path.insert(0, "/home/bk/source/vpype-vfab")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 # Use built-in assert for assertions
 
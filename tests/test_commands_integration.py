@@ -2,6 +2,17 @@
 
 import tempfile
 import os
+from pathlib import Path
+
+import pytest
+
+# Every test here spawns the vpype CLI
+pytestmark = pytest.mark.usefixtures("warm_vpype")
+
+_SVG_BYTES = b"""<?xml version="1.0" encoding="utf-8" ?>
+<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
+<line x1="0" y1="0" x2="100" y2="100" stroke="black" stroke-width="1"/>
+</svg>"""
 
 
 class TestPlottyAddCommand:
@@ -11,13 +22,7 @@ class TestPlottyAddCommand:
         """Test basic vfab-add command using subprocess."""
         with tempfile.TemporaryDirectory() as temp_dir:
             svg_file = os.path.join(temp_dir, "test.svg")
-            with open(svg_file, "w") as f:
-                f.write(
-                    """<?xml version="1.0" encoding="utf-8" ?>
-<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
-<line x1="0" y1="0" x2="100" y2="100" stroke="black" stroke-width="1"/>
-</svg>"""
-                )
+            Path(svg_file).write_bytes(_SVG_BYTES)
 
             import subprocess
 
@@ -45,13 +50,7 @@ class TestPlottyAddCommand:
         """Test vfab-add command with queue option."""
         with tempfile.TemporaryDirectory() as temp_dir:
             svg_file = os.path.join(temp_dir, "test.svg")
-            with open(svg_file, "w") as f:
-                f.write(
-                    """<?xml version="1.0" encoding="utf-8" ?>
-<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
-<line x1="0" y1="0" x2="100" y2="100" stroke="black" stroke-width="1"/>
-</svg>"""
-                )
+            Path(svg_file).write_bytes(_SVG_BYTES)
 
             import subprocess
 
@@ -81,13 +80,7 @@ class TestPlottyAddCommand:
         for preset in presets:
             with tempfile.TemporaryDirectory() as temp_dir:
                 svg_file = os.path.join(temp_dir, "test.svg")
-                with open(svg_file, "w") as f:
-                    f.write(
-                        """<?xml version="1.0" encoding="utf-8" ?>
-<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
-<line x1="0" y1="0" x2="100" y2="100" stroke="black" stroke-width="1"/>
-</svg>"""
-                    )
+                Path(svg_file).write_bytes(_SVG_BYTES)
 
                 import subprocess
 
@@ -115,13 +108,7 @@ class TestPlottyAddCommand:
         """Test vfab-add command with custom priority."""
         with tempfile.TemporaryDirectory() as temp_dir:
             svg_file = os.path.join(temp_dir, "test.svg")
-            with open(svg_file, "w") as f:
-                f.write(
-                    """<?xml version="1.0" encoding="utf-8" ?>
-<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
-<line x1="0" y1="0" x2="100" y2="100" stroke="black" stroke-width="1"/>
-</svg>"""
-                )
+            Path(svg_file).write_bytes(_SVG_BYTES)
 
             import subprocess
 
@@ -153,13 +140,7 @@ class TestPlottyQueueCommand:
         """Test basic vfab-queue command."""
         with tempfile.TemporaryDirectory() as temp_dir:
             svg_file = os.path.join(temp_dir, "test.svg")
-            with open(svg_file, "w") as f:
-                f.write(
-                    """<?xml version="1.0" encoding="utf-8" ?>
-<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
-<line x1="0" y1="0" x2="100" y2="100" stroke="black" stroke-width="1"/>
-</svg>"""
-                )
+            Path(svg_file).write_bytes(_SVG_BYTES)
 
             import subprocess
 
@@ -185,13 +166,7 @@ class TestPlottyQueueCommand:
         """Test vfab-queue command with custom workspace."""
         with tempfile.TemporaryDirectory() as temp_dir:
             svg_file = os.path.join(temp_dir, "test.svg")
-            with open(svg_file, "w") as f:
-                f.write(
-                    """<?xml version="1.0" encoding="utf-8" ?>
-<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
-<line x1="0" y1="0" x2="100" y2="100" stroke="black" stroke-width="1"/>
-</svg>"""
-                )
+            Path(svg_file).write_bytes(_SVG_BYTES)
 
             import subprocess
 
@@ -385,13 +360,7 @@ class TestCommandErrorHandling:
         """Test vfab-add with invalid preset."""
         with tempfile.TemporaryDirectory() as temp_dir:
             svg_file = os.path.join(temp_dir, "test.svg")
-            with open(svg_file, "w") as f:
-                f.write(
-                    """<?xml version="1.0" encoding="utf-8" ?>
-<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
-<line x1="0" y1="0" x2="100" y2="100" stroke="black" stroke-width="1"/>
-</svg>"""
-                )
+            Path(svg_file).write_bytes(_SVG_BYTES)
 
             import subprocess
 
@@ -7,7 +7,7 @@ from pathlib import Path
 import tempfile
 
 # Set up Qt mocks before any imports
-sys.path.insert(0, "/home/bk/source/vpype-vfab")
+sys.path.insert(0, str(Path(__file__).parent.parent))
 from tests.conftest import setup_qt_mocks
 
 setup_qt_mocks()
@@ -9,7 +9,7 @@ from unittest.mock import patch, MagicMock
 import pytest
 
 # Add the project root to sys.path to import directly
-sys.path.insert(0, "/home/bk/source/vpype-vfab")
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # Mock vpype imports to avoid Qt display issues
 mock_vpype = MagicMock()
@@ -15,31 +15,36 @@ def test_basic_functionality():
     """Test basic functionality of vpype-vfab."""
     print("Testing vpype-vfab basic functionality...")
 
-    # Test 1: Configuration
-    print("\n1. Testing configuration...")
-    with tempfile.TemporaryDirectory() as temp_dir:
-        config = VfabConfig(temp_dir)
-        assert config.workspace_path == Path(temp_dir)
+    # Tests 1 and 4 share one temporary root with a subdirectory each
+    with tempfile.TemporaryDirectory() as root:
+        config_dir = Path(root) / "config"
+        db_dir = Path(root) / "db"
+        config_dir.mkdir()
+        db_dir.mkdir()
+
+        # Test 1: Configuration
+        print("\n1. Testing configuration...")
+        config = VfabConfig(str(config_dir))
+        assert config.workspace_path == config_dir
         print("✓ Configuration works")
 
-    # Test 2: Preset validation
-    print("\n2. Testing preset validation...")
-    assert validate_preset("fast") == "fast"
-    assert validate_preset("default") == "default"
-    assert validate_preset("hq") == "hq"
-    print("✓ Preset validation works")
-
-    # Test 3: Job name generation
-    print("\n3. Testing job name generation...")
-    document = vpype.Document()
-    name = generate_job_name(document, "test_name")
-    assert name == "test_name"
-    print("✓ Job name generation works")
-
-    # Test 4: Database integration
-    print("\n4. Testing database integration...")
-    with tempfile.TemporaryDirectory() as temp_dir:
-        plotty = StreamlinedVfabIntegration(temp_dir)
+        # Test 2: Preset validation
+        print("\n2. Testing preset validation...")
+        assert validate_preset("fast") == "fast"
+        assert validate_preset("default") == "default"
+        assert validate_preset("hq") == "hq"
+        print("✓ Preset validation works")
+
+        # Test 3: Job name generation
+        print("\n3. Testing job name generation...")
+        document = vpype.Document()
+        name = generate_job_name(document, "test_name")
+        assert name == "test_name"
+        print("✓ Job name generation works")
+
+        # Test 4: Database integration
+        print("\n4. Testing database integration...")
+        plotty = StreamlinedVfabIntegration(str(db_dir))
 
         # Create a simple document
         document = vpype.Document()
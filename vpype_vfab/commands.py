@@ -214,9 +214,10 @@ def vfab_status(cmd, document, name, format, workspace):
         help="Output format",
     ),
     click.option("--limit", type=int, help="Limit number of jobs"),
+    click.option("--name-only", is_flag=True, help="Print only job names"),
     error_context="job listing",
 )
-def vfab_list(cmd, document, state, format, limit, workspace):
+def vfab_list(cmd, document, state, format, limit, name_only, workspace):
     """List vfab jobs."""
     jobs = cmd.plotty.list_jobs()
 
@@ -228,6 +229,12 @@ def vfab_list(cmd, document, state, format, limit, workspace):
     if limit:
         jobs = jobs[:limit]
 
+    if name_only:
+        # One name per line for scripts, without table/JSON formatting
+        for job in jobs:
+            click.echo(job.get("name", "Unnamed"))
+        return document
+
     if not jobs:
         click.echo("No jobs found.")
         return document